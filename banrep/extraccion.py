@@ -1,13 +1,25 @@
 # coding: utf-8
 """Modulo para extraer texto de archivos binarios."""
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import chain
 from pathlib import Path
+from urllib.parse import quote
+import hashlib
 import json
+import logging
+import os
 
+from lxml import etree
+from requests.adapters import HTTPAdapter
 from tika import parser
 import bs4
+import requests
 
-from banrep.io import crear_carpeta, iterar_rutas, guardar_texto
-from banrep.preprocesos import limpiar_extraccion
+from banrep.io import crear_carpeta, iterar_rutas, guardar_texto, mapear_ordenado
+from banrep.preprocesos import Limpiador
+
+logger = logging.getLogger(__name__)
 
 
 def extraer_info(archivo):
@@ -23,18 +35,9 @@ def extraer_info(archivo):
     tuple (str, dict)
         Content y Metadata.
     """
-    ruta = Path(archivo).resolve()
-
-    if ruta.is_file():
-        try:
-            info = parser.from_file(str(ruta), xmlContent=True)
-
-        except Exception:
-            print(f"No pudo extraerse información de {ruta.name}.")
-            info = dict()
-    else:
-        print(f"{ruta.name} no es un archivo.")
-        info = dict()
+    info, motivo = consultar_tika(archivo)
+    if motivo:
+        print(motivo)
 
     content = info.get("content")
     metadata = info.get("metadata")
@@ -42,7 +45,97 @@ def extraer_info(archivo):
     return content, metadata
 
 
-def procesar_xhtml(content, chars=0, basura=None):
+def consultar_tika(archivo):
+    """Consulta a Tika el contenido y metadata de archivo.
+
+    Parameters
+    ----------
+    archivo : str | Path
+        Ruta del archivo del cual se quiere extraer texto y metadata.
+
+    Returns
+    -------
+    tuple (dict, str | None)
+        Respuesta de Tika y motivo de falla si la hubo.
+    """
+    ruta = Path(archivo).resolve()
+
+    if not ruta.is_file():
+        return dict(), f"{ruta.name} no es un archivo."
+
+    try:
+        info = parser.from_file(str(ruta), xmlContent=True)
+
+    except Exception:
+        return dict(), f"No pudo extraerse información de {ruta.name}."
+
+    return info, None
+
+
+def iterar_parrafos(content, tamano=65536):
+    """Itera texto de cada párrafo en xhtml sin construir el árbol completo.
+
+    Produce los mismos textos que `get_text(strip=True)` de BeautifulSoup, en
+    el mismo orden: párrafos anidados se entregan al cerrar el exterior, en
+    orden de inicio, y se omite el contenido de elementos script, style y
+    template.
+
+    Parameters
+    ----------
+    content : str
+        xhtml que contiene texto.
+    tamano : int
+        Número de caracteres a entregar al parser en cada paso.
+
+    Yields
+    ------
+    str
+        Texto de cada párrafo.
+    """
+    parser = etree.HTMLPullParser(events=("start", "end"))
+    parrafos = []
+    abiertos = 0
+    plantillas = 0
+
+    trozos = (content[i : i + tamano] for i in range(0, len(content), tamano))
+    for trozo in chain(trozos, [None]):
+        if trozo is None:
+            try:
+                parser.close()
+            except etree.XMLSyntaxError:
+                pass
+        else:
+            parser.feed(trozo)
+
+        for evento, elemento in parser.read_events():
+            if evento == "start":
+                if elemento.tag == "template":
+                    plantillas += 1
+                elif elemento.tag == "p" and not plantillas:
+                    abiertos += 1
+                    parrafos.append(elemento)
+                continue
+
+            if elemento.tag == "template":
+                plantillas -= 1
+            elif elemento.tag == "p" and not plantillas:
+                abiertos -= 1
+                if not abiertos:
+                    omitidos = ("script", "style", "template")
+                    etree.strip_elements(elemento, *omitidos, with_tail=False)
+                    for parrafo in parrafos:
+                        yield "".join(t.strip() for t in parrafo.itertext())
+                    parrafos = []
+
+            if not abiertos:
+                elemento.clear()
+                padre = elemento.getparent()
+                if padre is not None:
+                    while elemento.getprevious() is not None:
+                        del padre[0]
+
+
+def procesar_xhtml(content, chars=0, basura=None, streaming=False):
     """Procesa texto contenido en xhmtl.
 
     Parameters
@@ -53,27 +146,481 @@ def procesar_xhtml(content, chars=0, basura=None):
         Mínimo número de caracteres en una línea de texto.
     basura : Iterable
         Caracteres a eliminar.
+    streaming : bool
+        Leer párrafos uno a uno con `iterar_parrafos` en vez de BeautifulSoup.
 
     Returns
     -------
     str
         Texto procesado.
     """
-    parsed = ""
-    sopa = bs4.BeautifulSoup(content, "lxml")
+    if streaming:
+        parrafos = iterar_parrafos(content)
+    else:
+        sopa = bs4.BeautifulSoup(content, "lxml")
+        parrafos = (p.get_text(strip=True) for p in sopa.find_all("p"))
+
+    limpiador = Limpiador(chars=chars, basura=basura)
+    textos = (limpiador(texto) for texto in parrafos if texto)
+
+    return "".join(f"{texto}\n" for texto in textos)
+
+
+def procesar_archivo(archivo, chars=0, basura=None, streaming=False):
+    """Extrae y procesa texto y metadata de archivo.
+
+    Parameters
+    ----------
+    archivo : str | Path
+        Ruta del archivo del cual se quiere extraer texto y metadata.
+    chars : int
+        Mínimo número de caracteres en una línea de texto.
+    basura : Iterable
+        Caracteres a eliminar.
+    streaming : bool
+        Procesar xhtml en modo streaming.
+
+    Returns
+    -------
+    tuple (str, dict, str | None)
+        Texto procesado, Metadata y motivo de falla si la hubo.
+    """
+    info, motivo = consultar_tika(archivo)
+    respuesta = (Path(archivo).name, info, motivo)
+
+    return procesar_respuesta(
+        respuesta, chars=chars, basura=basura, streaming=streaming
+    )
+
+
+def procesar_respuesta(respuesta, chars=0, basura=None, streaming=False):
+    """Procesa respuesta de Tika para un archivo.
+
+    Parameters
+    ----------
+    respuesta : tuple (str, dict, str | None)
+        Nombre de archivo, respuesta de Tika y motivo de falla si la hubo.
+    chars : int
+        Mínimo número de caracteres en una línea de texto.
+    basura : Iterable
+        Caracteres a eliminar.
+    streaming : bool
+        Procesar xhtml en modo streaming.
+
+    Returns
+    -------
+    tuple (str, dict, str | None)
+        Texto procesado, Metadata y motivo de falla si la hubo.
+    """
+    nombre, info, motivo = respuesta
+    if motivo:
+        return "", None, motivo
+
+    content = info.get("content")
+    metadata = info.get("metadata")
+    if content is None:
+        return "", metadata, f"Tika no devolvió contenido de {nombre}."
+
+    try:
+        texto = procesar_xhtml(content, chars=chars, basura=basura, streaming=streaming)
+    except Exception:
+        return "", metadata, f"No pudo procesarse xhtml de {nombre}."
+
+    return texto, metadata, None
+
+
+class ClienteTika:
+    """Cliente de un servidor Tika que reutiliza conexiones HTTP.
+
+    Parameters
+    ----------
+    endpoint : str
+        URL del servidor Tika.
+    concurrencia : int
+        Máximo número de solicitudes simultáneas al servidor.
+    timeout : float, optional
+        Segundos de espera máxima por cada solicitud.
+    """
+
+    def __init__(self, endpoint="http://localhost:9998", concurrencia=4, timeout=None):
+        """Opcional: endpoint, concurrencia, timeout."""
+        self.endpoint = endpoint.rstrip("/")
+        self.concurrencia = concurrencia
+        self.timeout = timeout
+
+        self.sesion = self.crear_sesion()
+
+    def __repr__(self):
+        return f"Cliente Tika en {self.endpoint} ({self.concurrencia} solicitudes)."
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.cerrar()
+
+    def crear_sesion(self):
+        """Crea sesión HTTP con tantas conexiones como solicitudes simultáneas."""
+        sesion = requests.Session()
+        adaptador = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrencia)
+        sesion.mount("http://", adaptador)
+        sesion.mount("https://", adaptador)
+
+        return sesion
+
+    def cerrar(self):
+        """Cierra conexiones abiertas."""
+        self.sesion.close()
+
+    def consultar(self, archivo):
+        """Consulta al servidor el contenido y metadata de archivo.
 
-    for p in sopa.find_all("p"):
-        texto = p.get_text(strip=True)
-        if texto:
-            texto = limpiar_extraccion(texto, chars=chars, basura=basura)
-            parsed += texto + "\n"
+        Parameters
+        ----------
+        archivo : str | Path
+            Ruta del archivo del cual se quiere extraer texto y metadata.
+
+        Returns
+        -------
+        tuple (dict, str | None)
+            Respuesta de Tika y motivo de falla si la hubo.
+        """
+        ruta = Path(archivo).resolve()
+
+        if not ruta.is_file():
+            return dict(), f"{ruta.name} no es un archivo."
+
+        headers = {
+            "Accept": "application/json",
+            "Content-Disposition": f"attachment; filename={quote(ruta.name)}",
+        }
+
+        try:
+            with open(ruta, "rb") as f:
+                r = self.sesion.put(
+                    f"{self.endpoint}/rmeta/xml",
+                    data=f,
+                    headers=headers,
+                    timeout=self.timeout,
+                )
+        except requests.RequestException:
+            return dict(), f"No pudo extraerse información de {ruta.name}."
+
+        if r.status_code != 200:
+            return dict(), f"Tika respondió {r.status_code} para {ruta.name}."
+
+        return parser._parse((r.status_code, r.text)), None
+
+    def extraer(self, archivo):
+        """Extrae contenido y metadata de archivo, como `extraer_info`.
+
+        Parameters
+        ----------
+        archivo : str | Path
+            Ruta del archivo del cual se quiere extraer texto y metadata.
+
+        Returns
+        -------
+        tuple (str, dict)
+            Content y Metadata.
+        """
+        info, motivo = self.consultar(archivo)
+        if motivo:
+            logger.info(motivo)
+
+        return info.get("content"), info.get("metadata")
+
+    def consultar_todos(self, rutas):
+        """Consulta varios archivos con solicitudes simultáneas, en orden.
+
+        Parameters
+        ----------
+        rutas : Iterable[str | Path]
+            Rutas de archivos a consultar.
+
+        Yields
+        ------
+        tuple (str, dict, str | None)
+            Nombre de archivo, respuesta de Tika y motivo de falla si la hubo.
+        """
+
+        def consultar(ruta):
+            return (Path(ruta).name, *self.consultar(ruta))
+
+        with ThreadPoolExecutor(max_workers=self.concurrencia) as hilos:
+            adelanto = 2 * self.concurrencia
+            yield from mapear_ordenado(consultar, rutas, hilos, adelanto)
+
+
+class Manifiesto:
+    """Índice de archivos originales ya extraídos y de sus salidas.
+
+    Guarda tamaño, fecha de modificación y hash de contenido de cada archivo
+    original, identificado por su ruta absoluta, con las rutas de texto y
+    metadata generadas a partir de él. Varios directorios de originales
+    pueden compartir la misma carpeta de salida.
+
+    Parameters
+    ----------
+    carpeta : str | Path
+        Directorio donde se guarda texto extraído.
+    nombre : str
+        Nombre del archivo de manifiesto dentro de carpeta.
+    """
 
-    return parsed
+    def __init__(self, carpeta, nombre=".manifiesto.json"):
+        """Requiere: carpeta.
 
+        Opcional: nombre.
+        """
+        self.carpeta = Path(carpeta).resolve()
+        self.archivo = self.carpeta.joinpath(nombre)
+
+        self.registros = self.leer()
+        self.salidas = {
+            salida: clave
+            for clave, registro in self.registros.items()
+            for salida in registro.get("salidas", [])
+        }
+
+    def __len__(self):
+        return len(self.registros)
+
+    def __contains__(self, clave):
+        return clave in self.registros
+
+    def __repr__(self):
+        return f"Manifiesto de {self.__len__()} archivos en {self.carpeta.name}."
+
+    def leer(self):
+        """Lee registros existentes del manifiesto."""
+        if not self.archivo.is_file():
+            return dict()
+
+        try:
+            with open(self.archivo, encoding="utf-8") as f:
+                return json.load(f)
+
+        except (OSError, ValueError):
+            logger.warning(f"Ignorando manifiesto ilegible {self.archivo.name}.")
+            return dict()
+
+    def guardar(self):
+        """Guarda registros en disco, reemplazando el manifiesto anterior."""
+        temporal = self.archivo.with_name(f"{self.archivo.name}.tmp")
+        with open(temporal, "w", encoding="utf-8") as out:
+            json.dump(self.registros, out, ensure_ascii=False)
+
+        os.replace(temporal, self.archivo)
+
+    @staticmethod
+    def calcular_hash(ruta):
+        """Calcula hash del contenido de un archivo.
+
+        Parameters
+        ----------
+        ruta : Path
+            Ruta del archivo.
+
+        Returns
+        -------
+        str
+            Hash blake2b del contenido.
+        """
+        h = hashlib.blake2b(digest_size=16)
+        with open(ruta, "rb") as f:
+            for bloque in iter(lambda: f.read(1 << 20), b""):
+                h.update(bloque)
+
+        return h.hexdigest()
+
+    def vigente(self, clave, ruta):
+        """Determina si archivo original no ha cambiado desde su registro.
+
+        Solo calcula hash si cambió la fecha de modificación y no el tamaño.
+
+        Parameters
+        ----------
+        clave : str
+            Ruta absoluta del archivo original.
+        ruta : Path
+            Ruta del archivo original.
+
+        Returns
+        -------
+        bool
+            Si el registro sigue vigente.
+        """
+        registro = self.registros.get(clave)
+        if not registro:
+            return False
+
+        info = ruta.stat()
+        if info.st_size != registro.get("size"):
+            return False
+
+        if info.st_mtime_ns == registro.get("mtime"):
+            return True
+
+        if self.calcular_hash(ruta) == registro.get("hash"):
+            registro["mtime"] = info.st_mtime_ns
+            return True
+
+        return False
+
+    def propietario(self, salida):
+        """Archivo original registrado con una salida.
+
+        Parameters
+        ----------
+        salida : Path
+            Ruta de archivo generado.
+
+        Returns
+        -------
+        str | None
+            Clave del archivo original, None si la salida no está registrada.
+        """
+        return self.salidas.get(Path(salida).relative_to(self.carpeta).as_posix())
+
+    def registrar(self, clave, ruta, salidas):
+        """Registra archivo original y sus salidas, eliminando salidas obsoletas.
+
+        Parameters
+        ----------
+        clave : str
+            Ruta absoluta del archivo original.
+        ruta : Path
+            Ruta del archivo original.
+        salidas : Iterable[Path]
+            Rutas de archivos generados a partir del original.
+        """
+        nuevas = [Path(s).relative_to(self.carpeta).as_posix() for s in salidas]
+        anterior = self.registros.get(clave, dict())
+        self.eliminar_salidas(s for s in anterior.get("salidas", []) if s not in nuevas)
+
+        for salida in nuevas:
+            self.salidas[salida] = clave
+
+        info = ruta.stat()
+        self.registros[clave] = {
+            "size": info.st_size,
+            "mtime": info.st_mtime_ns,
+            "hash": self.calcular_hash(ruta),
+            "salidas": nuevas,
+        }
+
+    def eliminar_salidas(self, salidas):
+        """Elimina archivos generados.
+
+        Parameters
+        ----------
+        salidas : Iterable[str]
+            Rutas relativas a carpeta de archivos generados.
+        """
+        for salida in salidas:
+            self.salidas.pop(salida, None)
+            try:
+                self.carpeta.joinpath(salida).unlink()
+            except FileNotFoundError:
+                pass
+
+    def podar(self, dirin, vistos):
+        """Elimina registros y salidas de archivos originales ya inexistentes.
+
+        Solo considera archivos registrados dentro de dirin, de modo que no
+        afecta salidas de otros directorios de originales.
+
+        Parameters
+        ----------
+        dirin : Path
+            Directorio absoluto donde están los documentos originales.
+        vistos : set
+            Claves de archivos originales encontrados en esta ejecución.
+
+        Returns
+        -------
+        int
+            Número de archivos originales eliminados del manifiesto.
+        """
+        n = 0
+        for clave in [c for c in self.registros if c not in vistos]:
+            ruta = Path(clave)
+            if not ruta.is_absolute() or dirin not in ruta.parents:
+                continue
+
+            if not ruta.exists():
+                registro = self.registros.pop(clave)
+                self.eliminar_salidas(registro.get("salidas", []))
+                n += 1
+
+        return n
+
+
+def procesar_todos(
+    rutas, chars=0, basura=None, workers=1, cliente=None, streaming=False
+):
+    """Extrae y procesa texto y metadata de archivos, en orden.
+
+    Parameters
+    ----------
+    rutas : Iterable[Path]
+        Rutas de archivos a procesar.
+    chars : int
+        Mínimo número de caracteres en una línea de texto.
+    basura : Iterable
+        Caracteres a eliminar.
+    workers : int
+        Número de procesos a usar. Si es 1 se procesa secuencialmente.
+    cliente : banrep.extraccion.ClienteTika, optional
+        Cliente para consultar Tika. Si no se da, se usa `tika.parser`.
+    streaming : bool
+        Procesar xhtml en modo streaming.
+
+    Yields
+    ------
+    tuple (str, dict, str | None)
+        Texto procesado, Metadata y motivo de falla de cada archivo.
+    """
+    basura = list(basura) if basura else None
 
-def extraer_todos(dirin, dirout, recursivo=False, exts=None, basura=None, chars=0):
+    if cliente is None:
+        procesar = partial(
+            procesar_archivo, chars=chars, basura=basura, streaming=streaming
+        )
+        items = rutas
+    else:
+        procesar = partial(
+            procesar_respuesta, chars=chars, basura=basura, streaming=streaming
+        )
+        items = cliente.consultar_todos(rutas)
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            yield from mapear_ordenado(procesar, items, pool, 2 * workers)
+    else:
+        yield from map(procesar, items)
+
+
+def extraer_todos(
+    dirin,
+    dirout,
+    recursivo=False,
+    exts=None,
+    basura=None,
+    chars=0,
+    workers=1,
+    fallas=None,
+    cliente=None,
+    manifiesto=True,
+    streaming=False,
+    podar=False,
+):
     """Extrae y guarda texto y metadata de archivos.
 
+    Archivos cuya salida coincide con la de otro original (mismo nombre sin
+    extensión, ej. a.pdf y a.docx) no se procesan y se reportan como fallas.
+
     Parameters
     ----------
     dirin : str | Path
@@ -88,6 +635,20 @@ def extraer_todos(dirin, dirout, recursivo=False, exts=None, basura=None, chars=
         Caracteres a eliminar.
     chars : int
         Mínimo número de caracteres en una línea de texto.
+    workers : int
+        Número de procesos para extraer y procesar en paralelo.
+    fallas : dict, optional
+        Si se suministra, se llena con {ruta: motivo} de archivos fallidos.
+    cliente : banrep.extraccion.ClienteTika, optional
+        Cliente persistente de servidor Tika.
+    manifiesto : bool
+        Usar manifiesto en dirout para procesar solo archivos nuevos o
+        modificados. Si es False se omiten archivos cuyo texto ya existe.
+    streaming : bool
+        Procesar xhtml párrafo a párrafo, con menor uso de memoria.
+    podar : bool
+        Eliminar salidas de archivos borrados de dirin desde la última
+        ejecución. Requiere manifiesto.
 
     Returns
     -------
@@ -99,30 +660,96 @@ def extraer_todos(dirin, dirout, recursivo=False, exts=None, basura=None, chars=
     dirmeta = crear_carpeta(dirtextos.joinpath("metadata"))
 
     nparts = len(dirdocs.parts)
+    registro = Manifiesto(dirtextos) if manifiesto else None
 
-    n = 0
+    if fallas is None:
+        fallas = dict()
+
+    pendientes = []
+    vistos = set()
+    destinos = dict()
     for ruta in iterar_rutas(dirdocs, recursivo=recursivo, exts=exts):
         partes = ruta.parent.parts[nparts:]
-        dirtexto = dirtextos.joinpath(*partes)
-        if not dirtexto.exists():
-            dirtexto = crear_carpeta(dirtexto)
-
-        archivo = dirtexto.joinpath(f"{ruta.stem}.txt")
-        if not archivo.exists():
-            content, metadata = extraer_info(ruta)
-            texto = procesar_xhtml(content, chars=chars, basura=basura)
-            if texto:
-                guardar_texto(texto, archivo)
+        archivo = dirtextos.joinpath(*partes, f"{ruta.stem}.txt")
+        metafile = dirmeta.joinpath(*partes, f"{ruta.stem}.json")
+
+        otro = destinos.setdefault(archivo, ruta)
+        if otro != ruta:
+            fallas[str(ruta)] = f"Misma salida que {otro.name}."
+            continue
+
+        if registro is None:
+            if not archivo.exists():
+                pendientes.append((ruta, archivo, metafile, None))
+            continue
+
+        clave = ruta.as_posix()
+        vistos.add(clave)
+
+        otro = registro.propietario(archivo)
+        if otro is not None and otro != clave:
+            if Path(otro).exists():
+                fallas[str(ruta)] = f"Misma salida que {otro}."
+                continue
+
+            registro.registros.pop(otro, None)
+
+        if clave in registro:
+            if registro.vigente(clave, ruta):
+                continue
+        elif archivo.exists():
+            existentes = [s for s in (archivo, metafile) if s.exists()]
+            registro.registrar(clave, ruta, existentes)
+            continue
+
+        pendientes.append((ruta, archivo, metafile, clave))
+
+    resultados = procesar_todos(
+        (ruta for ruta, _, _, _ in pendientes),
+        chars=chars,
+        basura=basura,
+        workers=workers,
+        cliente=cliente,
+        streaming=streaming,
+    )
 
-                metaout = dirmeta.joinpath(*partes)
-                if not metaout.exists():
-                    metaout = crear_carpeta(metaout)
+    n = 0
+    carpetas = set()
+    try:
+        for (ruta, archivo, metafile, clave), resultado in zip(pendientes, resultados):
+            texto, metadata, motivo = resultado
+            if motivo:
+                fallas[str(ruta)] = motivo
+                continue
+
+            salidas = []
+            if texto:
+                for carpeta in (archivo.parent, metafile.parent):
+                    if carpeta not in carpetas:
+                        carpetas.add(crear_carpeta(carpeta))
 
-                metafile = metaout.joinpath(f"{ruta.stem}.json")
+                guardar_texto(texto, archivo)
                 with open(metafile, "w", encoding="utf-8") as out:
                     json.dump(metadata, out, ensure_ascii=False)
+
+                salidas = [archivo, metafile]
                 n += 1
 
+            if registro is not None:
+                registro.registrar(clave, ruta, salidas)
+
+        if registro is not None and podar:
+            podados = registro.podar(dirdocs, vistos)
+            if podados:
+                logger.info(f"Eliminadas salidas de {podados} archivos borrados.")
+
+    finally:
+        if registro is not None:
+            registro.guardar()
+
+    if fallas:
+        logger.warning(f"{len(fallas)} archivos no pudieron extraerse.")
+
     return n
 
 
@@ -158,6 +785,35 @@ def main():
         type=int,
         help="Eliminar texto con pocos caracteres. (%(default)s). Ej: --chars 10",
     )
+    parser.add_argument(
+        "--workers",
+        default=1,
+        type=int,
+        help="Procesos para extraer en paralelo. (%(default)s). Ej: --workers 4",
+    )
+    parser.add_argument(
+        "--tika",
+        required=False,
+        help="URL de servidor Tika a usar. Ej: --tika http://localhost:9998",
+    )
+    parser.add_argument(
+        "--concurrencia",
+        default=4,
+        type=int,
+        help="Solicitudes simultáneas a servidor --tika. (%(default)s)",
+    )
+    parser.add_argument(
+        "--streaming",
+        default=False,
+        action="store_true",
+        help="Procesar xhtml párrafo a párrafo. (%(default)s) Ej: --streaming",
+    )
+    parser.add_argument(
+        "--podar",
+        default=False,
+        action="store_true",
+        help="Eliminar textos de archivos borrados. (%(default)s) Ej: --podar",
+    )
 
     args = parser.parse_args()
 
@@ -167,12 +823,36 @@ def main():
     exts = args.exts
     basura = args.basura
     chars = args.chars
+    workers = args.workers
+
+    cliente = None
+    if args.tika:
+        cliente = ClienteTika(args.tika, concurrencia=args.concurrencia)
 
+    fallas = dict()
     n = extraer_todos(
-        dirin, dirout, recursivo=recursivo, exts=exts, basura=basura, chars=chars
+        dirin,
+        dirout,
+        recursivo=recursivo,
+        exts=exts,
+        basura=basura,
+        chars=chars,
+        workers=workers,
+        fallas=fallas,
+        cliente=cliente,
+        streaming=args.streaming,
+        podar=args.podar,
     )
+    if cliente:
+        cliente.cerrar()
+
     print(f"{n} nuevos archivos guardados en carpeta {str(dirout)}")
 
+    if fallas:
+        print(f"{len(fallas)} archivos no pudieron extraerse:")
+        for ruta, motivo in fallas.items():
+            print(f"  {ruta}: {motivo}")
+
 
 if __name__ == "__main__":
     main()
@@ -1,12 +1,31 @@
 # coding: utf-8
 """Módulo de interacción con el sistema, lectura y escritura."""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+import gzip
 import logging
 import json
+import os
 import random
 
 import pandas as pd
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
 from banrep.preprocesos import filtrar_cortas
 
 logger = logging.getLogger(__name__)
@@ -35,10 +54,83 @@ def crear_carpeta(nombre):
     return ruta
 
 
-def iterar_rutas(carpeta, recursivo=False, aleatorio=False, exts=None):
+def mapear_ordenado(funcion, items, executor, adelanto):
+    """Aplica funcion a cada item en un executor, conservando el orden.
+
+    Mantiene como máximo `adelanto` tareas enviadas y no consumidas.
+
+    Parameters
+    ----------
+    funcion : Callable
+        Función a aplicar a cada item.
+    items : Iterable
+        Elementos a procesar.
+    executor : concurrent.futures.Executor
+        Pool de hilos o procesos que ejecuta las tareas.
+    adelanto : int
+        Máximo número de tareas pendientes.
+
+    Yields
+    ------
+    object
+        Resultado de cada item, en el mismo orden de items.
+    """
+    pendientes = deque()
+    for item in items:
+        pendientes.append(executor.submit(funcion, item))
+        if len(pendientes) >= adelanto:
+            yield pendientes.popleft().result()
+
+    while pendientes:
+        yield pendientes.popleft().result()
+
+
+def escanear_carpeta(carpeta, recursivo=False, exts=None):
+    """Itera rutas de archivos en carpeta, directorio por directorio.
+
+    Ordena solo las entradas de cada directorio, lo que produce el mismo
+    orden que ordenar todas las rutas, sin tener que acumularlas.
+
+    Parameters
+    ----------
+    carpeta : str | Path
+        Directorio a iterar.
+    recursivo: bool
+        Iterar recursivamente. No sigue vínculos simbólicos a directorios.
+    exts: set[str], optional
+        Solo considerar estas extensiones, sin punto inicial.
+
+    Yields
+    ------
+    Path
+        Ruta de archivo.
+    """
+    with os.scandir(carpeta) as it:
+        entradas = sorted(it, key=lambda e: os.path.normcase(e.name))
+
+    for entrada in entradas:
+        nombre = entrada.name
+        if entrada.is_file():
+            if nombre.startswith("."):
+                continue
+
+            if exts:
+                i = nombre.rfind(".")
+                ext = nombre[i + 1 :] if 0 < i < len(nombre) - 1 else ""
+                if ext not in exts:
+                    continue
+
+            yield Path(entrada.path)
+
+        elif recursivo and entrada.is_dir(follow_symlinks=False):
+            yield from escanear_carpeta(entrada.path, recursivo=True, exts=exts)
+
+
+def iterar_rutas(carpeta, recursivo=False, aleatorio=False, exts=None, semilla=None):
     """Itera rutas de archivos en carpeta.
 
     Puede ser o no recursivo, en orden o aleatorio, limitando extensiones.
+    En orden, las rutas se entregan a medida que se recorre cada directorio.
 
     Parameters
     ----------
@@ -49,7 +141,9 @@ def iterar_rutas(carpeta, recursivo=False, aleatorio=False, exts=None):
     aleatorio : bool
         Iterar aleatoriamente.
     exts: Iterable[str]
-        Solo considerar estas extensiones.
+        Solo considerar estas extensiones (con o sin punto inicial).
+    semilla : int, optional
+        Semilla para que orden aleatorio sea reproducible.
 
     Yields
     ------
@@ -57,23 +151,16 @@ def iterar_rutas(carpeta, recursivo=False, aleatorio=False, exts=None):
         Ruta de archivo.
     """
     absoluto = Path(carpeta).resolve()
+    exts = {e.lstrip(".") for e in exts} if exts else None
 
-    if recursivo:
-        rutas = (r for r in absoluto.glob("**/*"))
-    else:
-        rutas = (r for r in absoluto.iterdir())
-
-    rutas = (r for r in rutas if r.is_file() and not r.name.startswith("."))
-
-    if exts:
-        rutas = (r for r in rutas if any(r.suffix.endswith(e) for e in exts))
-
-    todas = sorted(rutas)
+    rutas = escanear_carpeta(absoluto, recursivo=recursivo, exts=exts)
 
     if aleatorio:
-        random.shuffle(todas)
-
-    yield from todas
+        todas = list(rutas)
+        random.Random(semilla).shuffle(todas)
+        yield from todas
+    else:
+        yield from rutas
 
 
 def leer_texto(archivo):
@@ -126,9 +213,149 @@ def guardar_texto(texto, archivo):
             ruta.write("\n")
 
 
+def codificar_json(objeto, rapido=False):
+    """Codifica objeto como una línea json.
+
+    Parameters
+    ----------
+    objeto : dict
+    rapido : bool, optional
+        Usar orjson si está instalado. orjson escribe NaN e infinitos como
+        null; la librería estándar los conserva. Objetos que orjson no
+        soporta se codifican con la librería estándar.
+
+    Returns
+    -------
+    bytes
+        Objeto json en utf-8, sin salto de línea.
+    """
+    if rapido and orjson is not None:
+        try:
+            return orjson.dumps(objeto)
+        except TypeError:
+            pass
+
+    return json.dumps(objeto, ensure_ascii=False).encode("utf-8")
+
+
+def decodificar_json(linea):
+    """Decodifica una línea json, usando orjson si está instalado.
+
+    Líneas que orjson no acepta (por ejemplo con NaN) se decodifican con la
+    librería estándar.
+
+    Parameters
+    ----------
+    linea : bytes
+
+    Returns
+    -------
+    dict
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(linea)
+        except orjson.JSONDecodeError:
+            pass
+
+    return json.loads(linea)
+
+
+def abrir_binario(archivo, modo="rb"):
+    """Abre archivo en modo binario, comprimido según su extensión.
+
+    Parameters
+    ----------
+    archivo : str | Path
+        Ruta de archivo. Extensiones .gz y .zst se comprimen.
+    modo : str
+        Modo de apertura (rb | wb).
+
+    Returns
+    -------
+    file object
+    """
+    ruta = Path(archivo)
+
+    if ruta.suffix == ".gz":
+        return gzip.open(ruta, modo)
+
+    if ruta.suffix == ".zst":
+        if zstandard is None:
+            raise ImportError(f"Se requiere zstandard para abrir {ruta.name}.")
+        return zstandard.open(ruta, modo)
+
+    return open(ruta, modo)
+
+
+def nombre_fragmento(archivo, i):
+    """Ruta de fragmento i de archivo jsonl.
+
+    Parameters
+    ----------
+    archivo : Path
+        Ruta de archivo jsonl, por ejemplo frases.jsonl.gz
+    i : int
+        Número de fragmento.
+
+    Returns
+    -------
+    Path
+        Ruta del fragmento, por ejemplo frases-00003.jsonl.gz
+    """
+    comprimido = archivo.suffix if archivo.suffix in (".gz", ".zst") else ""
+    base, ext = os.path.splitext(archivo.name[: len(archivo.name) - len(comprimido)])
+
+    return archivo.with_name(f"{base}-{i:05}{ext}{comprimido}")
+
+
+def rutas_jsonl(archivo):
+    """Rutas de archivo jsonl o, si no existe, de sus fragmentos en orden.
+
+    Cada fragmento puede leerse de forma independiente con `leer_jsonl`,
+    por ejemplo en procesos paralelos.
+
+    Parameters
+    ----------
+    archivo : str | Path
+        Ruta de archivo jsonl, como se usó en `guardar_jsonl`.
+
+    Returns
+    -------
+    list[Path]
+        Rutas a leer.
+    """
+    ruta = Path(archivo).resolve()
+    if ruta.exists():
+        return [ruta]
+
+    return fragmentos_jsonl(ruta) or [ruta]
+
+
+def fragmentos_jsonl(ruta):
+    """Rutas de fragmentos existentes de archivo jsonl, en orden.
+
+    Parameters
+    ----------
+    ruta : Path
+        Ruta de archivo jsonl, como se usó en `guardar_jsonl`.
+
+    Returns
+    -------
+    list[Path]
+        Rutas de fragmentos, vacía si no hay.
+    """
+    patron = nombre_fragmento(ruta, 0).name.replace("00000", "[0-9]" * 5)
+
+    return sorted(ruta.parent.glob(patron))
+
+
 def leer_jsonl(archivo):
     """Lee objetos json de archivo.
 
+    Lee también archivos comprimidos (.gz, .zst) y archivos guardados en
+    fragmentos por `guardar_jsonl`.
+
     Parameters
     ----------
     archivo : str | Path
@@ -139,51 +366,100 @@ def leer_jsonl(archivo):
     dict
        Contenido de cada objeto json.
     """
-    ruta = Path(archivo).resolve()
-    nombre = ruta.name
-    carpeta = ruta.parent.name
-
-    try:
-        with open(ruta, encoding="utf-8") as f:
-            for line in f:
-                try:
-                    yield json.loads(line.strip())
-
-                except json.JSONDecodeError:
-                    msg = f"Ignorando fila de archivo {nombre} en {carpeta}."
-                    logger.info(msg)
-                except ValueError:
-                    msg = f"Ignorando fila de archivo {nombre} en {carpeta}."
-                    logger.info(msg)
-
-    except OSError:
-        logger.info(f"No puede abrirse archivo {nombre} en {carpeta}.")
-    except UnicodeDecodeError:
-        logger.info(f"No puede leerse archivo {nombre} en {carpeta}.")
-    except Exception:
-        logger.info(f"Error inesperado leyendo {nombre} en {carpeta}")
-
-
-def guardar_jsonl(archivo, objs):
+    for ruta in rutas_jsonl(archivo):
+        nombre = ruta.name
+        carpeta = ruta.parent.name
+
+        try:
+            with abrir_binario(ruta, "rb") as f:
+                for line in f:
+                    try:
+                        yield decodificar_json(line)
+
+                    except json.JSONDecodeError:
+                        msg = f"Ignorando fila de archivo {nombre} en {carpeta}."
+                        logger.info(msg)
+                    except ValueError:
+                        msg = f"Ignorando fila de archivo {nombre} en {carpeta}."
+                        logger.info(msg)
+
+        except OSError:
+            logger.info(f"No puede abrirse archivo {nombre} en {carpeta}.")
+        except UnicodeDecodeError:
+            logger.info(f"No puede leerse archivo {nombre} en {carpeta}.")
+        except Exception:
+            logger.info(f"Error inesperado leyendo {nombre} en {carpeta}")
+
+
+def guardar_jsonl(archivo, objs, max_registros=None, max_bytes=None, rapido=False):
     """Guarda objetos json en archivo.
 
+    Comprime según extensión (.gz, .zst). Si se da max_registros o max_bytes,
+    guarda en fragmentos numerados (frases-00000.jsonl, frases-00001.jsonl...)
+    que `leer_jsonl` lee en orden usando el nombre original. Elimina antes
+    versiones previas del archivo, fragmentado o no.
+
     Parameters
     ----------
     archivo : str | Path
         Ruta del archivo en el cual se quiere guardar objetos json.
     objs : Iterable[dict]
         Contenido de cada objeto json a guardar.
+    max_registros : int, optional
+        Máximo número de registros en cada fragmento.
+    max_bytes : int, optional
+        Tamaño aproximado máximo (sin comprimir) de cada fragmento.
+    rapido : bool, optional
+        Codificar con orjson si está instalado (NaN se guarda como null).
+
+    Returns
+    -------
+    list[Path]
+        Rutas de archivos guardados.
     """
     ruta = Path(archivo).resolve()
-    nombre = ruta.name
-    with open(ruta, "w", newline="\n", encoding="utf-8") as f:
-        n = 0
+    fragmentar = bool(max_registros or max_bytes)
+
+    for anterior in fragmentos_jsonl(ruta):
+        anterior.unlink()
+    if fragmentar and ruta.exists():
+        ruta.unlink()
+
+    rutas = []
+    f = None
+    n = nf = bf = 0
+    try:
         for objeto in objs:
-            json.dump(objeto, f, ensure_ascii=False)
-            f.write("\n")
+            lleno = (max_registros and nf >= max_registros) or (
+                max_bytes and bf >= max_bytes
+            )
+            if f is None or lleno:
+                if f is not None:
+                    f.close()
+
+                destino = nombre_fragmento(ruta, len(rutas)) if fragmentar else ruta
+                f = abrir_binario(destino, "wb")
+                rutas.append(destino)
+                nf = bf = 0
+
+            linea = codificar_json(objeto, rapido) + b"\n"
+            f.write(linea)
             n += 1
+            nf += 1
+            bf += len(linea)
+
+        if f is None:
+            destino = nombre_fragmento(ruta, 0) if fragmentar else ruta
+            f = abrir_binario(destino, "wb")
+            rutas.append(destino)
+
+    finally:
+        if f is not None:
+            f.close()
 
-    logger.info(f"Guardados {n} registros en {nombre}")
+    logger.info(f"Guardados {n} registros en {len(rutas)} archivos {ruta.name}")
+
+    return rutas
 
 
 def leer_palabras(archivo, hoja, c_grupo, c_palabras):
@@ -247,6 +523,12 @@ class Textos:
         Solo considerar estas extensiones de archivo.
     chars : int
         Mínimo número de caracteres en una línea de texto.
+    semilla : int, optional
+        Semilla para que orden aleatorio sea reproducible.
+    workers : int
+        Hilos para leer archivos por adelantado. Si es 1 se lee secuencialmente.
+    prefetch : int, optional
+        Máximo número de archivos leídos por adelantado (2 * workers).
 
     Yields
     ------
@@ -255,17 +537,28 @@ class Textos:
     """
 
     def __init__(
-        self, carpeta, recursivo=False, aleatorio=False, exts=None, chars=0,
+        self,
+        carpeta,
+        recursivo=False,
+        aleatorio=False,
+        exts=None,
+        chars=0,
+        semilla=None,
+        workers=1,
+        prefetch=None,
     ):
         """Requiere: carpeta.
 
-        Opcional: recursivo, aleatorio, exts, chars.
+        Opcional: recursivo, aleatorio, exts, chars, semilla, workers, prefetch.
         """
         self.absoluto = Path(carpeta).resolve()
         self.recursivo = recursivo
         self.aleatorio = aleatorio
         self.exts = exts
         self.chars = chars
+        self.semilla = semilla
+        self.workers = workers
+        self.prefetch = prefetch or 2 * workers
 
         self.n = 0
         self.nprg = 0
@@ -284,34 +577,77 @@ class Textos:
         self.n = 0
         self.nprg = 0
 
-        for archivo in iterar_rutas(
+        rutas = iterar_rutas(
             self.absoluto,
             aleatorio=self.aleatorio,
             recursivo=self.recursivo,
             exts=self.exts,
-        ):
-            texto = leer_texto(archivo)
-            if texto:
-                self.n += 1
-                if self.chars:
-                    texto = filtrar_cortas(texto, chars=self.chars)
+            semilla=self.semilla,
+        )
+
+        if self.workers > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as hilos:
+                leidos = mapear_ordenado(self.leer, rutas, hilos, self.prefetch)
+                yield from self.parrafos(leidos)
+        else:
+            yield from self.parrafos(map(self.leer, rutas))
+
+    def leer(self, archivo):
+        """Lee texto de archivo, filtrando líneas cortas.
+
+        Parameters
+        ----------
+        archivo : Path
+            Ruta del archivo del cual se quiere leer texto.
+
+        Returns
+        -------
+        tuple (Path, str | None)
+            Ruta y texto de archivo. None si archivo no tiene texto.
+        """
+        texto = leer_texto(archivo)
+        if not texto:
+            return archivo, None
 
-                comun = {
-                    "id_file": f"{self.n:0>7}",
-                    "archivo": archivo.name,
-                    "fuente": archivo.parent.name,
-                }
+        if self.chars:
+            texto = filtrar_cortas(texto, chars=self.chars)
 
-                for parag in texto.splitlines():
-                    if parag:
-                        self.nprg += 1
-                        meta = {"id_parag": f"{self.nprg:0>7}", **comun}
+        return archivo, texto
 
-                        if self.nprg % 10000 == 0:
-                            msg = self.__repr__()
-                            logger.info(msg)
+    def parrafos(self, leidos):
+        """Texto y metadata de cada párrafo en textos leídos.
 
-                        yield parag, meta
+        Parameters
+        ----------
+        leidos : Iterable[tuple (Path, str | None)]
+            Ruta y texto de cada archivo, en orden.
+
+        Yields
+        ------
+        tuple (str, dict)
+            Texto y metadata de cada párrafo.
+        """
+        for archivo, texto in leidos:
+            if texto is None:
+                continue
+
+            self.n += 1
+            comun = {
+                "id_file": f"{self.n:0>7}",
+                "archivo": archivo.name,
+                "fuente": archivo.parent.name,
+            }
+
+            for parag in texto.splitlines():
+                if parag:
+                    self.nprg += 1
+                    meta = {"id_parag": f"{self.nprg:0>7}", **comun}
+
+                    if self.nprg % 10000 == 0:
+                        msg = self.__repr__()
+                        logger.info(msg)
+
+                    yield parag, meta
 
 
 class Datos:
@@ -327,6 +663,8 @@ class Datos:
         Nombre de columnas a incluir como metadata.
     chars : int
         Mínimo número de caracteres en una línea de texto.
+    tamano : int
+        Número de registros a convertir por lote.
 
     Yields
     ------
@@ -334,15 +672,16 @@ class Datos:
         Texto y metadata de cada registro.
     """
 
-    def __init__(self, df, textcol, metacols, chars=0):
+    def __init__(self, df, textcol, metacols, chars=0, tamano=10000):
         """Requiere: df, textcol, metacols.
 
-        Opcional: chars.
+        Opcional: chars, tamano.
         """
         self.df = df
         self.textcol = textcol
         self.metacols = metacols
         self.chars = chars
+        self.tamano = tamano
 
     def __len__(self):
         return len(self.df.index)
@@ -352,18 +691,51 @@ class Datos:
 
     def __iter__(self):
         """Texto y metadata de cada registro en DataFrame."""
-        for row in self.df.itertuples():
-            texto = getattr(row, self.textcol)
-            meta = {k: getattr(row, k) for k in self.metacols}
+        for textos, metas in self.lotes():
+            yield from zip(textos, metas)
+
+    def lotes(self, tamano=None):
+        """Textos y metadata por lotes, extraídos por columnas.
+
+        Útil para entregar textos directamente a `nlp.pipe`.
+
+        Parameters
+        ----------
+        tamano : int, optional
+            Número de registros por lote (self.tamano).
+
+        Yields
+        ------
+        tuple (list[str], list[dict])
+            Textos y metadata de registros de cada lote.
+        """
+        tamano = tamano or self.tamano
+        metacols = list(self.metacols)
+
+        textos = self.df[self.textcol]
+        columnas = [self.df[k] for k in metacols]
 
+        for i in range(0, len(textos), tamano):
+            lote = textos.iloc[i : i + tamano].tolist()
             if self.chars:
-                texto = filtrar_cortas(texto, chars=self.chars)
+                lote = [
+                    t if pd.isna(t) else filtrar_cortas(t, chars=self.chars)
+                    for t in lote
+                ]
+            if metacols:
+                valores = [c.iloc[i : i + tamano].tolist() for c in columnas]
+                metas = [dict(zip(metacols, fila)) for fila in zip(*valores)]
+            else:
+                metas = [dict() for _ in lote]
 
-            yield texto, meta
+            yield lote, metas
 
 
 class Registros:
-    """Texto y metadata de registros en archivos csv o Excel.
+    """Texto y metadata de registros en archivos csv, Excel, Parquet o Feather.
+
+    Solo se leen las columnas textcol y metacols. Con chunksize los archivos
+    csv y Parquet se leen por partes, con memoria acotada.
 
     Parameters
     ----------
@@ -381,6 +753,10 @@ class Registros:
         Mínimo número de caracteres en una línea de texto.
     hoja : str
         Nombre de hoja en archivo excel.
+    chunksize : int, optional
+        Número de filas a leer en cada parte.
+    dtype : dict, optional
+        Tipos de datos de columnas, ej. {"fecha": "category"}.
 
     Yields
     ------
@@ -397,10 +773,12 @@ class Registros:
         exts=None,
         chars=0,
         hoja=None,
+        chunksize=None,
+        dtype=None,
     ):
         """Requiere: carpeta, textcol, metacols.
 
-        Opcional: recursivo, exts, chars, hoja.
+        Opcional: recursivo, exts, chars, hoja, chunksize, dtype.
         """
         self.absoluto = Path(carpeta).resolve()
         self.textcol = textcol
@@ -409,6 +787,10 @@ class Registros:
         self.hoja = hoja
         self.recursivo = recursivo
         self.exts = exts
+        self.chunksize = chunksize
+        self.dtype = dtype
+
+        self.columnas = list(dict.fromkeys([textcol, *metacols]))
 
         self.n = 0
 
@@ -425,13 +807,66 @@ class Registros:
         for archivo in iterar_rutas(
             self.absoluto, recursivo=self.recursivo, exts=self.exts
         ):
-            if archivo.suffix.endswith(".csv"):
-                df = pd.read_csv(archivo)
-            else:
-                df = pd.read_excel(archivo, sheet_name=self.hoja)
+            self.n += 1
 
-            df = df.dropna(subset=[self.textcol])
+            for df in self.leer_partes(archivo):
+                df = df.dropna(subset=[self.textcol])
 
-            self.n += 1
+                yield from Datos(df, self.textcol, self.metacols, chars=self.chars)
+
+    def leer_partes(self, archivo):
+        """Lee columnas requeridas de archivo, por partes si hay chunksize.
+
+        Parameters
+        ----------
+        archivo : Path
+            Ruta de archivo csv, Excel, Parquet o Feather.
 
-            yield from Datos(df, self.textcol, self.metacols, chars=self.chars)
+        Yields
+        ------
+        pd.DataFrame
+            Registros de cada parte del archivo.
+        """
+        cols = self.columnas
+        sufijo = archivo.suffix
+
+        if sufijo.endswith(".csv"):
+            yield from self.partes(
+                pd.read_csv(
+                    archivo, usecols=cols, dtype=self.dtype, chunksize=self.chunksize
+                )
+            )
+
+        elif sufijo in (".parquet", ".pq"):
+            if self.chunksize and pq is not None:
+                lotes = pq.ParquetFile(archivo).iter_batches(
+                    batch_size=self.chunksize, columns=cols
+                )
+                for lote in lotes:
+                    yield self.convertir(lote.to_pandas())
+            else:
+                yield self.convertir(pd.read_parquet(archivo, columns=cols))
+
+        elif sufijo in (".feather", ".arrow"):
+            yield self.convertir(pd.read_feather(archivo, columns=cols))
+
+        else:
+            yield pd.read_excel(
+                archivo, sheet_name=self.hoja, usecols=cols, dtype=self.dtype
+            )
+
+    @staticmethod
+    def partes(leido):
+        """Itera DataFrame o lector por partes de pandas."""
+        if isinstance(leido, pd.DataFrame):
+            yield leido
+        else:
+            with leido:
+                yield from leido
+
+    def convertir(self, df):
+        """Aplica dtype a DataFrame leído sin soporte nativo de dtype."""
+        if self.dtype:
+            return df.astype(self.dtype)
+
+        return df
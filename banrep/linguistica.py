@@ -1,12 +1,626 @@
 # coding: utf-8
 """Módulo para procesar documentos lingüísticamente."""
+from itertools import islice
+from operator import attrgetter
+from pathlib import Path
+import hashlib
+import json
 import logging
+import os
 
-from spacy.pipeline import EntityRuler
-from spacy.tokens import Token
+import numpy as np
+import pandas as pd
+from spacy import about
+from spacy.attrs import (
+    DEP,
+    ENT_IOB,
+    ENT_TYPE,
+    IS_ALPHA,
+    IS_OOV,
+    IS_PUNCT,
+    IS_STOP,
+    LEMMA,
+    LENGTH,
+    LOWER,
+    ORTH,
+    POS,
+    SPACY,
+    TAG,
+)
+from spacy.language import Language
+from spacy.matcher import PhraseMatcher
+from spacy.pipeline import EntityRuler, Sentencizer
+from spacy.tokens import DocBin, Token
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
 
 logger = logging.getLogger(__name__)
 
+ATRIBUTOS = [
+    "text",
+    "i",
+    "ent_type_",
+    "ent_iob_",
+    "lower_",
+    "is_alpha",
+    "is_oov",
+    "pos_",
+    "dep_",
+]
+
+COMPONENTES = {
+    "pos_": "tagger",
+    "tag_": "tagger",
+    "lemma_": "tagger",
+    "dep_": "parser",
+    "ent_type_": "ner",
+    "ent_iob_": "ner",
+}
+
+COLUMNAS = {
+    "text": ORTH,
+    "lower_": LOWER,
+    "lemma_": LEMMA,
+    "pos_": POS,
+    "tag_": TAG,
+    "dep_": DEP,
+    "ent_type_": ENT_TYPE,
+    "ent_iob_": ENT_IOB,
+    "is_alpha": IS_ALPHA,
+    "is_oov": IS_OOV,
+    "is_stop": IS_STOP,
+    "is_punct": IS_PUNCT,
+}
+
+CATEGORIAS_IOB = ["", "I", "O", "B"]
+
+PERSONALIZADOS = ("cumplimiento", "presencia")
+
+
+def fijar_extensiones(grupos=None):
+    """Fija extensiones de Token globalmente.
+
+    Parameters
+    ----------
+    grupos : Iterable[str], optional
+        Nombres de grupos de palabras a identificar.
+    """
+    if not Token.has_extension("ok_token"):
+        Token.set_extension("ok_token", default=True)
+
+    if grupos:
+        for grupo in grupos:
+            if not Token.has_extension(grupo):
+                Token.set_extension(grupo, default=False)
+
+
+def mascara_extension(doc, ext, idx):
+    """Valores de extensión de Token para todo un documento.
+
+    Lee directamente `doc.user_data`, donde spaCy guarda valores fijados
+    con `token._.set`, sin crear objetos Token.
+
+    Parameters
+    ----------
+    doc : spacy.tokens.Doc
+    ext : str
+        Nombre de extensión de Token.
+    idx : np.ndarray
+        Posición de caracter de cada token en doc.
+
+    Returns
+    -------
+    np.ndarray
+        Valor booleano de extensión en cada token.
+    """
+    default = Token.get_extension(ext)[0]
+    mascara = np.full(len(idx), bool(default))
+
+    fijados = [
+        (k[2], v)
+        for k, v in doc.user_data.items()
+        if isinstance(k, tuple) and len(k) == 4 and k[0] == "._." and k[1] == ext
+    ]
+    if fijados:
+        posiciones, valores = zip(*fijados)
+        mascara[np.searchsorted(idx, posiciones)] = valores
+
+    return mascara
+
+
+def columna_categorica(codigos, categorias, formato="numpy"):
+    """Columna de strings codificada como diccionario.
+
+    Parameters
+    ----------
+    codigos : np.ndarray
+        Posición en categorias de cada valor (-1 si es nulo).
+    categorias : list
+        Valores únicos.
+    formato : str (numpy | arrow)
+        Tipo de columna a crear.
+
+    Returns
+    -------
+    pd.Categorical | pyarrow.DictionaryArray
+    """
+    if formato == "arrow":
+        indices = pa.array(codigos, type=pa.int32(), mask=codigos < 0)
+        return pa.DictionaryArray.from_arrays(indices, pa.array(categorias))
+
+    return pd.Categorical.from_codes(codigos, categories=categorias)
+
+
+class FiltroTokens:
+    """Filtro de tokens compilado una sola vez a partir de filtros.
+
+    Valores excluidos se convierten a frozensets de hashes o IDs de spaCy, y
+    solo se evalúan los filtros configurados.
+
+    Parameters
+    ----------
+    filtros : dict, optional
+        Filtros a evaluar en cada token.
+        (is_alpha, lower_, pos_, dep_, ent_type_, chars)
+    vocab : spacy.vocab.Vocab
+        Vocabulario para convertir valores a hashes.
+    """
+
+    ATRIBUTOS = {
+        "lower_": "lower",
+        "pos_": "pos",
+        "dep_": "dep",
+        "ent_type_": "ent_type",
+    }
+
+    def __init__(self, filtros, vocab):
+        """Requiere: filtros, vocab."""
+        self.filtros = filtros or dict()
+
+        self.alpha = bool(self.filtros.get("is_alpha"))
+        self.chars = self.filtros.get("chars", 0)
+
+        self.excluidos = []
+        for attr, attr_id in self.ATRIBUTOS.items():
+            valores = self.filtros.get(attr)
+            if valores:
+                hashes = frozenset(vocab.strings.add(v) for v in valores)
+                self.excluidos.append((attrgetter(attr_id), hashes))
+
+        self.activo = bool(self.alpha or self.chars or self.excluidos)
+
+    def __repr__(self):
+        return f"Filtro de tokens {self.filtros}."
+
+    def __call__(self, token):
+        """Determina si token pasa los filtros.
+
+        Parameters
+        ----------
+        token : spacy.tokens.Token
+            Token a evaluar.
+
+        Returns
+        -------
+        bool
+            Si token pasa los filtros o no.
+        """
+        if self.alpha and not token.is_alpha:
+            return False
+
+        for valor, excluidos in self.excluidos:
+            if valor(token) in excluidos:
+                return False
+
+        if self.chars:
+            return len(token) > self.chars
+
+        return True
+
+
+class Cumplimiento:
+    """Componente que marca tokens que no pasan filtros (ok_token=False).
+
+    Es serializable, por lo que puede usarse con `nlp.pipe(n_process=n)`.
+
+    Parameters
+    ----------
+    nlp : spacy.language.Language
+        Modelo de lenguaje spaCy.
+    filtros : dict, optional
+        Filtros a evaluar en cada token.
+        (is_alpha, lower_, pos_, dep_, ent_type_, chars)
+    """
+
+    name = "cumplimiento"
+
+    def __init__(self, nlp, filtros=None):
+        """Requiere: nlp.
+
+        Opcional: filtros.
+        """
+        self.filtros = filtros
+        self.filtro = FiltroTokens(filtros, nlp.vocab)
+
+        fijar_extensiones()
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        fijar_extensiones()
+
+    def __call__(self, doc):
+        """Cambia valores durante componente cumplimiento si falla filtros.
+
+        Parameters
+        ----------
+        doc : spacy.tokens.Doc
+
+        Returns
+        -------
+        doc : spacy.tokens.Doc
+        """
+        if not self.filtro.activo:
+            return doc
+
+        cumple = self.filtro
+        for token in doc:
+            if not cumple(token):
+                token._.set("ok_token", False)
+
+        return doc
+
+    def token_cumple(self, token):
+        """Determina si token pasa los filtros.
+
+        Parameters
+        ----------
+        token : spacy.tokens.Token
+            Token a evaluar.
+
+        Returns
+        -------
+        bool
+            Si token pasa los filtros o no.
+        """
+        return self.filtro(token)
+
+
+class Presencia:
+    """Componente que marca tokens presentes en grupos de palabras.
+
+    Palabras de un token se buscan en una tabla de hashes de `lower` en un
+    solo recorrido del documento. Expresiones de varios tokens se buscan con
+    un PhraseMatcher sobre LOWER.
+
+    Es serializable, por lo que puede usarse con `nlp.pipe(n_process=n)`.
+
+    Parameters
+    ----------
+    nlp : spacy.language.Language
+        Modelo de lenguaje spaCy, para tokenizar expresiones.
+    grupos : dict (str: set)
+        Grupos de listas de palabras a identificar. Valores vacíos (NaN) se
+        ignoran y los demás se convierten a str, como en columnas de Excel.
+    """
+
+    name = "presencia"
+
+    def __init__(self, nlp, grupos):
+        """Requiere: nlp, grupos."""
+        self.grupos = grupos
+
+        self.tabla = dict()
+        self.claves = dict()
+        self.matcher = PhraseMatcher(nlp.vocab, attr="LOWER")
+
+        for grupo, palabras in grupos.items():
+            expresiones = []
+            for palabra in palabras:
+                if pd.isna(palabra):
+                    continue
+
+                palabra = str(palabra)
+                doc = nlp.make_doc(palabra)
+                if len(doc) > 1:
+                    expresiones.append(doc)
+                elif len(doc) == 1:
+                    clave = nlp.vocab.strings.add(palabra)
+                    self.tabla.setdefault(clave, []).append(grupo)
+
+            if expresiones:
+                self.claves[nlp.vocab.strings.add(grupo)] = grupo
+                self.matcher.add(grupo, None, *expresiones)
+
+        self.tabla = {k: tuple(v) for k, v in self.tabla.items()}
+
+        fijar_extensiones(self.grupos)
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        fijar_extensiones(self.grupos)
+
+    def __call__(self, doc):
+        """Cambia valores durante componente presencia si en grupos.
+
+        Parameters
+        ----------
+        doc : spacy.tokens.Doc
+
+        Returns
+        -------
+        spacy.tokens.Doc
+        """
+        tabla = self.tabla
+        for token in doc:
+            grupos = tabla.get(token.lower)
+            if grupos:
+                for grupo in grupos:
+                    token._.set(grupo, True)
+
+        if self.claves:
+            for clave, inicio, fin in self.matcher(doc):
+                grupo = self.claves[clave]
+                for token in doc[inicio:fin]:
+                    token._.set(grupo, True)
+
+        return doc
+
+
+Language.factories["cumplimiento"] = lambda nlp, **cfg: Cumplimiento(nlp, **cfg)
+Language.factories["presencia"] = lambda nlp, **cfg: Presencia(nlp, **cfg)
+
+
+class CacheDocs:
+    """Cache en disco de documentos anotados por el pipeline estadístico.
+
+    Documentos se guardan en fragmentos DocBin, cada uno con su propio índice
+    de hash del texto, en una subcarpeta identificada por modelo, versión y
+    componentes activos. Agregar un fragmento no reescribe los existentes.
+    Componentes personalizados (cumplimiento, presencia) no se guardan, se
+    aplican al leer, de modo que cambiar filtros o grupos no requiere anotar
+    de nuevo.
+
+    Parameters
+    ----------
+    carpeta : str | Path
+        Directorio del cache.
+    lang : spacy.language.Language
+        Modelo de lenguaje spaCy.
+    desactivar : list[str], optional
+        Componentes desactivados al anotar.
+    entes : dict (str: set), optional
+        Grupos de expresiones a considerar como Entities.
+    """
+
+    def __init__(self, carpeta, lang, desactivar=None, entes=None):
+        """Requiere: carpeta, lang.
+
+        Opcional: desactivar, entes.
+        """
+        self.lang = lang
+        self.desactivar = list(desactivar or []) + [
+            nombre for nombre in PERSONALIZADOS if lang.has_pipe(nombre)
+        ]
+        self.activos = [n for n in lang.pipe_names if n not in self.desactivar]
+        self.entes = entes
+
+        self.firma = self.calcular_firma()
+        self.carpeta = Path(carpeta).resolve().joinpath(self.firma)
+        self.carpeta.mkdir(parents=True, exist_ok=True)
+
+        self.attrs = self.atributos()
+        self.fragmentos = 0
+        self.indice = self.leer()
+
+    def __len__(self):
+        return len(self.indice)
+
+    def __contains__(self, texto):
+        return self.clave(texto) in self.indice
+
+    def __repr__(self):
+        return f"Cache de {self.__len__()} documentos en {self.firma}."
+
+    def calcular_firma(self):
+        """Identifica modelo, versión y componentes activos del pipeline.
+
+        Returns
+        -------
+        str
+            Hash blake2b de la configuración.
+        """
+        meta = self.lang.meta
+        config = {
+            "spacy": about.__version__,
+            "lang": meta.get("lang"),
+            "name": meta.get("name"),
+            "version": meta.get("version"),
+            "pipes": self.activos,
+            "entes": {k: sorted(v) for k, v in (self.entes or {}).items()},
+        }
+        serial = json.dumps(config, sort_keys=True, ensure_ascii=False)
+
+        return hashlib.blake2b(serial.encode("utf-8"), digest_size=8).hexdigest()
+
+    def atributos(self):
+        """Atributos de token a guardar según componentes activos.
+
+        Returns
+        -------
+        list[str]
+            Atributos para DocBin.
+        """
+        attrs = ["ORTH", "TAG", "POS", "LEMMA", "ENT_IOB", "ENT_TYPE"]
+        if "parser" in self.activos:
+            attrs.extend(["HEAD", "DEP"])
+        else:
+            attrs.append("SENT_START")
+
+        return attrs
+
+    @staticmethod
+    def clave(texto):
+        """Hash del texto de un documento.
+
+        Parameters
+        ----------
+        texto : str
+
+        Returns
+        -------
+        str
+            Hash blake2b del texto.
+        """
+        return hashlib.blake2b(texto.encode("utf-8"), digest_size=16).hexdigest()
+
+    def leer(self):
+        """Lee índices existentes de los fragmentos del cache.
+
+        Un fragmento es válido solo si su índice existe, pues este se escribe
+        después del DocBin.
+
+        Returns
+        -------
+        dict (str: list[int, int])
+            Fragmento y posición de cada hash del texto.
+        """
+        indice = dict()
+        for archivo in sorted(self.carpeta.glob("docs-[0-9]*.json")):
+            i = int(archivo.stem.split("-")[1])
+            self.fragmentos = max(self.fragmentos, i + 1)
+
+            try:
+                with open(archivo, encoding="utf-8") as f:
+                    claves = json.load(f)
+
+            except (OSError, ValueError):
+                logger.warning(f"Ignorando índice ilegible {archivo.name}.")
+                continue
+
+            for posicion, clave in enumerate(claves):
+                indice[clave] = [i, posicion]
+
+        return indice
+
+    def ruta_fragmento(self, i):
+        """Ruta de fragmento i del cache."""
+        return self.carpeta.joinpath(f"docs-{i:05}.spacy")
+
+    def ruta_indice(self, i):
+        """Ruta del índice de fragmento i del cache."""
+        return self.carpeta.joinpath(f"docs-{i:05}.json")
+
+    def guardar_fragmento(self, claves, docs):
+        """Guarda documentos nuevos en un fragmento con su índice.
+
+        Parameters
+        ----------
+        claves : list[str]
+            Hash del texto de cada documento.
+        docs : list[spacy.tokens.Doc]
+            Documentos anotados.
+        """
+        i = self.fragmentos
+
+        docbin = DocBin(attrs=self.attrs)
+        for doc in docs:
+            docbin.add(doc)
+
+        ruta = self.ruta_fragmento(i)
+        temporal = ruta.with_name(f"{ruta.name}.tmp")
+        temporal.write_bytes(docbin.to_bytes())
+        os.replace(temporal, ruta)
+
+        ruta = self.ruta_indice(i)
+        temporal = ruta.with_name(f"{ruta.name}.tmp")
+        with open(temporal, "w", encoding="utf-8") as out:
+            json.dump(claves, out)
+        os.replace(temporal, ruta)
+
+        for posicion, clave in enumerate(claves):
+            self.indice[clave] = [i, posicion]
+
+        self.fragmentos += 1
+
+    def cargar(self, claves):
+        """Carga documentos del cache, leyendo cada fragmento una sola vez.
+
+        Parameters
+        ----------
+        claves : Iterable[str]
+            Hash del texto de cada documento.
+
+        Returns
+        -------
+        dict (str: spacy.tokens.Doc)
+            Documento de cada hash.
+        """
+        por_fragmento = {}
+        for clave in set(claves):
+            i, posicion = self.indice[clave]
+            por_fragmento.setdefault(i, {})[posicion] = clave
+
+        docs = {}
+        for i, posiciones in sorted(por_fragmento.items()):
+            docbin = DocBin().from_bytes(self.ruta_fragmento(i).read_bytes())
+            ultima = max(posiciones)
+            for posicion, doc in enumerate(docbin.get_docs(self.lang.vocab)):
+                if posicion in posiciones:
+                    docs[posiciones[posicion]] = doc
+                if posicion == ultima:
+                    break
+
+        return docs
+
+    def procesar(self, datos, n_process=1, batch_size=1000):
+        """Documentos anotados, leídos del cache o anotados y guardados.
+
+        Parameters
+        ----------
+        datos : Iterable[tuple (str, dict)]
+            Texto y metadata de cada documento.
+        n_process : int, optional
+            Procesos a usar en anotación lingüística.
+        batch_size : int, optional
+            Número de documentos anotados y guardados en cada fragmento.
+
+        Yields
+        ------
+        tuple (spacy.tokens.Doc, dict)
+            Documento sin componentes personalizados y su metadata.
+        """
+        datos = iter(datos)
+        while True:
+            lote = list(islice(datos, batch_size))
+            if not lote:
+                break
+
+            claves = [self.clave(texto) for texto, _ in lote]
+            nuevos = {}
+            for clave, (texto, _) in zip(claves, lote):
+                if clave not in self.indice:
+                    nuevos.setdefault(clave, texto)
+
+            guardados = [c for c in claves if c in self.indice]
+            anotados = self.cargar(guardados)
+            if nuevos:
+                docs = list(
+                    self.lang.pipe(
+                        nuevos.values(),
+                        n_process=n_process,
+                        batch_size=batch_size,
+                        disable=self.desactivar,
+                    )
+                )
+                anotados.update(zip(nuevos, docs))
+                self.guardar_fragmento(list(nuevos), docs)
+
+            for clave, (_, meta) in zip(claves, lote):
+                yield anotados[clave], meta
+
 
 class Frases:
     """Anotaciones lingüísticas de cada frase en corpus.
@@ -26,17 +640,41 @@ class Frases:
         Grupos de listas de palabras a identificar.
     entes : dict (str: set), optional
         Grupos de expresiones a considerar como Entities.
+    n_process : int, optional
+        Procesos a usar en anotación lingüística.
+    batch_size : int, optional
+        Número de documentos enviados al pipeline en cada lote.
+    attrs : list[str], optional
+        Atributos de token requeridos (por defecto ATRIBUTOS). Se desactivan
+        componentes (tagger, parser, ner) que ni estos ni los filtros
+        necesitan, y si no hay parser las frases se identifican con un
+        sentencizer.
+    cache : str | Path, optional
+        Directorio de cache de documentos anotados (ver CacheDocs).
 
     Yields
     ------
     dict (text: str, tokens: list[dict], meta: dict)
         Anotaciones lingüísticas de cada frase.
+        Ver también `Frases.lotes` para lotes columnares.
     """
 
-    def __init__(self, lang, datos, tk=0, filtros=None, grupos=None, entes=None):
+    def __init__(
+        self,
+        lang,
+        datos,
+        tk=0,
+        filtros=None,
+        grupos=None,
+        entes=None,
+        n_process=1,
+        batch_size=1000,
+        attrs=None,
+        cache=None,
+    ):
         """Requiere: lang, datos.
 
-        Opcional tk, filtros, grupos, entes.
+        Opcional tk, filtros, grupos, entes, n_process, batch_size, attrs, cache.
         """
         self.lang = lang
         self.datos = datos
@@ -44,12 +682,22 @@ class Frases:
         self.filtros = filtros
         self.grupos = grupos
         self.entes = entes
+        self.n_process = n_process
+        self.batch_size = batch_size
+        self.attrs = list(attrs) if attrs else ATRIBUTOS
 
         self.exts_token = self.extensiones()
 
         self.fijar_extensiones()
         self.fijar_pipes()
 
+        self.desactivar = self.componentes_innecesarios()
+        self.sentencizer = self.crear_sentencizer()
+
+        self.cache = None
+        if cache:
+            self.cache = CacheDocs(cache, lang, self.desactivar, self.entes)
+
         self.n = 0
 
     def __len__(self):
@@ -61,18 +709,208 @@ class Frases:
     def __iter__(self):
         """Anotaciones lingüísticas de cada frase."""
         self.n = 0
-        for doc, meta in self.lang.pipe(self.datos, as_tuples=True):
+        docs = self.docs()
+        for doc, meta in docs:
             for frase in self.detalles_doc(doc):
                 self.n += 1
                 frase["meta"] = meta.copy()
                 frase["meta"].update({"id_sent": f"{self.n:0>7}"})
 
                 if self.n % 50000 == 0:
-                        msg = self.__repr__()
-                        logger.info(msg)
+                    msg = self.__repr__()
+                    logger.info(msg)
 
                 yield frase
 
+    def docs(self):
+        """Documentos anotados por el pipeline, o leídos del cache.
+
+        Yields
+        ------
+        tuple (spacy.tokens.Doc, dict)
+            Documento anotado y su metadata.
+        """
+        if self.cache is None:
+            docs = self.lang.pipe(
+                self.datos,
+                as_tuples=True,
+                n_process=self.n_process,
+                batch_size=self.batch_size,
+                disable=self.desactivar,
+            )
+        else:
+            docs = self.cache.procesar(self.datos, self.n_process, self.batch_size)
+
+        for doc, meta in docs:
+            if self.sentencizer is not None:
+                doc = self.sentencizer(doc)
+
+            if self.cache is not None:
+                doc = self.cumplimiento(doc)
+                if self.grupos:
+                    doc = self.presencia(doc)
+
+            yield doc, meta
+
+    def lotes(self, tamano=100000, formato="numpy"):
+        """Anotaciones lingüísticas de tokens en lotes columnares.
+
+        Columnas se construyen con `Doc.to_array`, sin crear un dict por token.
+        Atributos de texto se codifican como diccionario (categorías), y cada
+        token incluye id_sent y la metadata de su documento.
+
+        Parameters
+        ----------
+        tamano : int, optional
+            Número aproximado de tokens en cada lote.
+        formato : str (numpy | arrow), optional
+            Arrays numpy con pd.Categorical, o pyarrow.RecordBatch.
+
+        Yields
+        ------
+        dict (str: np.ndarray | pd.Categorical) | pyarrow.RecordBatch
+            Anotaciones lingüísticas de tokens que pasan filtros.
+        """
+        if formato not in ("numpy", "arrow"):
+            raise ValueError(f"Formato {formato} no soportado (numpy | arrow).")
+
+        if formato == "arrow" and pa is None:
+            raise ImportError("Se requiere pyarrow para formato arrow.")
+
+        faltantes = [a for a in self.attrs if a not in COLUMNAS and a != "i"]
+        if faltantes:
+            raise ValueError(f"Atributos sin versión columnar: {faltantes}.")
+
+        atributos = [a for a in self.attrs if a in COLUMNAS]
+        ids = [COLUMNAS[a] for a in atributos] + [LENGTH, SPACY]
+
+        self.n = 0
+        docs = self.docs()
+
+        partes = []
+        acumulados = 0
+        for doc, meta in docs:
+            columnas = self.columnas_doc(doc, atributos, ids)
+            if columnas is None:
+                continue
+
+            partes.append((columnas, meta))
+            acumulados += len(columnas["id_sent"])
+
+            if acumulados >= tamano:
+                yield self.armar_lote(partes, formato)
+                partes = []
+                acumulados = 0
+
+        if partes:
+            yield self.armar_lote(partes, formato)
+
+    def columnas_doc(self, doc, atributos, ids):
+        """Columnas de tokens que pasan filtros en frases de documento.
+
+        Parameters
+        ----------
+        doc : spacy.tokens.Doc
+        atributos : list[str]
+            Atributos de token con versión columnar.
+        ids : list[int]
+            IDs de atributos en spaCy, seguidos de LENGTH y SPACY.
+
+        Returns
+        -------
+        dict (str: np.ndarray) | None
+            Valores de cada columna, o None si ninguna frase pasa filtros.
+        """
+        arr = doc.to_array(ids)
+        largo = arr[:, -2].astype(np.int64)
+        ancho = largo + arr[:, -1].astype(np.int64)
+        idx = np.cumsum(ancho) - ancho
+
+        ok = mascara_extension(doc, "ok_token", idx)
+
+        posiciones = []
+        frases = []
+        for sent in doc.sents:
+            pos = np.flatnonzero(ok[sent.start : sent.end]) + sent.start
+            if len(pos) > self.tk:
+                self.n += 1
+                posiciones.append(pos)
+                frases.append(np.full(len(pos), self.n, dtype=np.int64))
+
+                if self.n % 50000 == 0:
+                    msg = self.__repr__()
+                    logger.info(msg)
+
+        if not posiciones:
+            return None
+
+        pos = np.concatenate(posiciones)
+
+        columnas = {"id_sent": np.concatenate(frases)}
+        for j, a in enumerate(atributos):
+            columnas[a] = arr[pos, j]
+        if "i" in self.attrs:
+            columnas["i"] = pos
+        columnas["chars"] = largo[pos]
+
+        for ext in sorted(self.exts_token):
+            columnas[ext] = mascara_extension(doc, ext, idx)[pos]
+
+        return columnas
+
+    def armar_lote(self, partes, formato):
+        """Une columnas de documentos en un lote.
+
+        Parameters
+        ----------
+        partes : list[tuple (dict (str: np.ndarray), dict)]
+            Columnas y metadata de cada documento.
+        formato : str (numpy | arrow)
+            Tipo de lote a crear.
+
+        Returns
+        -------
+        dict (str: np.ndarray | pd.Categorical) | pyarrow.RecordBatch
+            Anotaciones lingüísticas de tokens.
+        """
+        strings = self.lang.vocab.strings
+        conteos = [len(columnas["id_sent"]) for columnas, _ in partes]
+
+        lote = {}
+        for nombre in partes[0][0]:
+            valores = np.concatenate([columnas[nombre] for columnas, _ in partes])
+
+            if nombre == "ent_iob_":
+                codigos = valores.astype(np.int32)
+                lote[nombre] = columna_categorica(codigos, CATEGORIAS_IOB, formato)
+            elif nombre in COLUMNAS and not nombre.startswith("is_"):
+                unicos, codigos = np.unique(valores, return_inverse=True)
+                categorias = [strings[int(h)] for h in unicos]
+                codigos = codigos.astype(np.int32)
+                lote[nombre] = columna_categorica(codigos, categorias, formato)
+            elif nombre.startswith("is_"):
+                lote[nombre] = valores.astype(bool)
+            else:
+                lote[nombre] = valores
+
+        claves = list(dict.fromkeys(k for _, meta in partes for k in meta))
+        for clave in claves:
+            valores = pd.Series([meta.get(clave) for _, meta in partes], dtype=object)
+            codigos, categorias = valores.factorize()
+            codigos = np.repeat(codigos.astype(np.int32), conteos)
+            lote[clave] = columna_categorica(codigos, list(categorias), formato)
+
+        if formato == "arrow":
+            return pa.RecordBatch.from_arrays(
+                [
+                    pa.array(v) if isinstance(v, np.ndarray) else v
+                    for v in lote.values()
+                ],
+                names=list(lote),
+            )
+
+        return lote
+
     def extensiones(self):
         """Crea lista de extensiones a usar."""
         exts = set()
@@ -93,22 +931,31 @@ class Frases:
 
     def fijar_extensiones(self):
         """Fija extensiones globalmente."""
-        if not Token.has_extension("ok_token"):
-            Token.set_extension("ok_token", default=True)
+        fijar_extensiones(self.grupos)
 
-        if self.grupos:
-            for grupo in self.grupos:
-                if not Token.has_extension(grupo):
-                    Token.set_extension(grupo, default=False)
+    def fijar_pipe(self, nombre, config):
+        """Agrega o reemplaza componente registrado en Language.factories.
+
+        Parameters
+        ----------
+        nombre : str
+            Nombre del componente (cumplimiento | presencia).
+        config : dict
+            Configuración del componente.
+        """
+        componente = self.lang.create_pipe(nombre, config=config)
+
+        if self.lang.has_pipe(nombre):
+            self.lang.replace_pipe(nombre, componente)
+        else:
+            self.lang.add_pipe(componente, name=nombre, last=True)
 
     def fijar_pipes(self):
         """Fija componentes adicionales del Pipeline de procesamiento."""
-        if not self.lang.has_pipe("cumplimiento"):
-            self.lang.add_pipe(self.cumplimiento, name="cumplimiento", last=True)
+        self.fijar_pipe("cumplimiento", {"filtros": self.filtros})
 
         if self.grupos:
-            if not self.lang.has_pipe("presencia"):
-                self.lang.add_pipe(self.presencia, name="presencia", last=True)
+            self.fijar_pipe("presencia", {"grupos": self.grupos})
 
         if self.entes:
             if not self.lang.has_pipe("entes"):
@@ -117,6 +964,51 @@ class Frases:
 
                 self.lang.add_pipe(ruler, name="entes", before="ner")
 
+    def componentes_innecesarios(self):
+        """Determina componentes del pipeline a desactivar según atributos.
+
+        Returns
+        -------
+        list[str]
+            Nombres de componentes a desactivar.
+        """
+        requeridos = set(self.attrs)
+        if self.filtros:
+            requeridos.update(a for a, v in self.filtros.items() if v)
+
+        necesarios = {COMPONENTES[a] for a in requeridos if a in COMPONENTES}
+        opcionales = set(COMPONENTES.values())
+
+        desactivar = [
+            nombre
+            for nombre in self.lang.pipe_names
+            if nombre in opcionales and nombre not in necesarios
+        ]
+
+        if desactivar:
+            logger.info(f"Componentes desactivados: {', '.join(desactivar)}.")
+
+        return desactivar
+
+    def crear_sentencizer(self):
+        """Sentencizer para identificar frases si el parser no se usa.
+
+        Se aplica a documentos que entrega el pipeline, sin agregarlo a
+        `lang`, que puede estar compartido con otros usos.
+
+        Returns
+        -------
+        spacy.pipeline.Sentencizer | None
+            None si el pipeline ya identifica frases.
+        """
+        if self.lang.has_pipe("sentencizer"):
+            return None
+
+        if self.lang.has_pipe("parser") and "parser" not in self.desactivar:
+            return None
+
+        return Sentencizer()
+
     def token_cumple(self, token):
         """Determina si token pasa los filtros.
 
@@ -130,23 +1022,7 @@ class Frases:
         bool
             Si token pasa los filtros o no.
         """
-        if not self.filtros:
-            return True
-
-        if self.filtros.get("is_alpha"):
-            if not token.is_alpha:
-                return False
-
-        attr = ["lower_", "pos_", "dep_", "ent_type_"]
-        ok = [getattr(token, a) not in self.filtros.get(a, list()) for a in attr]
-        if not all(ok):
-            return False
-
-        chars = self.filtros.get("chars", 0)
-        if chars:
-            return len(token) > chars
-
-        return True
+        return self.lang.get_pipe("cumplimiento").token_cumple(token)
 
     def cumplimiento(self, doc):
         """Cambia valores durante componente cumplimiento si falla filtros.
@@ -159,11 +1035,7 @@ class Frases:
         -------
         doc : spacy.tokens.Doc
         """
-        for token in doc:
-            if not self.token_cumple(token):
-                token._.set("ok_token", False)
-
-        return doc
+        return self.lang.get_pipe("cumplimiento")(doc)
 
     def presencia(self, doc):
         """Cambia valores durante componente presencia si en grupos.
@@ -176,13 +1048,7 @@ class Frases:
         -------
         spacy.tokens.Doc
         """
-        for grupo in self.grupos:
-            palabras = self.grupos.get(grupo)
-            for token in doc:
-                if token.lower_ in palabras:
-                    token._.set(grupo, True)
-
-        return doc
+        return self.lang.get_pipe("presencia")(doc)
 
     def token_features(self, token):
         """Extrae anotaciones lingüísticas de un token.
@@ -197,19 +1063,7 @@ class Frases:
         dict (str, str | bool)
             Anotaciones lingüísticas del token.
         """
-        attributes = [
-            "text",
-            "i",
-            "ent_type_",
-            "ent_iob_",
-            "lower_",
-            "is_alpha",
-            "is_oov",
-            "pos_",
-            "dep_",
-        ]
-
-        anotaciones = {a: getattr(token, a) for a in attributes}
+        anotaciones = {a: getattr(token, a) for a in self.attrs}
         anotaciones["chars"] = len(token)
 
         for ext in self.exts_token:
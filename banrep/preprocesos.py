@@ -1,7 +1,21 @@
 # coding: utf-8
 """Módulo para funciones de preprocesamiento de texto."""
+from functools import lru_cache
 import re
 
+LETRAS = "A-Za-zÀ-Üà-ü"
+
+# Asume ord('-') == 45
+RE_FRAGMENTOS = re.compile(r"-\n+")
+
+# Asume ord 8211 ó 8212
+RE_GUIONES = re.compile(r"[—–]{1,}")
+RE_GUION_PALABRA = re.compile(rf"(\W)–([{LETRAS}]+)")
+RE_PALABRA_GUION = re.compile(rf"([{LETRAS}]+)–(\W)")
+
+RE_NUMERO_LETRAS = re.compile(rf"(\d+)([{LETRAS}]{{2,}}?|\()")
+RE_LETRAS_NUMERO = re.compile(rf"([{LETRAS}]{{2,}}?|\))(\d+)")
+
 
 def filtrar_cortas(texto, chars=0):
     """Filtra líneas en texto de longitud chars o inferior.
@@ -18,12 +32,11 @@ def filtrar_cortas(texto, chars=0):
     str
        Texto filtrado.
     """
-    filtrado = ""
-    for linea in texto.splitlines():
-        if len(linea) > chars:
-            filtrado += linea + "\n"
+    lineas = [linea for linea in texto.splitlines() if len(linea) > chars]
+    if not lineas:
+        return ""
 
-    return filtrado
+    return "\n".join(lineas) + "\n"
 
 
 def unir_fragmentos(texto):
@@ -38,8 +51,7 @@ def unir_fragmentos(texto):
     str
         Texto con palabras de fin de línea unidas si estaban partidas.
     """
-    # Asume ord('-') == 45
-    return re.sub(r'-\n+', '', texto)
+    return RE_FRAGMENTOS.sub("", texto)
 
 
 def separar_guiones(texto):
@@ -54,11 +66,10 @@ def separar_guiones(texto):
     str
         Texto con guiones de fragmentos separados de las palabras.
     """
-    # Asume ord 8211 ó 8212
-    nuevo = re.sub(r'[—–]{1,}', '–', texto)
-    nuevo = re.sub(r'(\W)–([A-Za-zÀ-Üà-ü]+)', r'\1– \2', nuevo)
+    nuevo = RE_GUIONES.sub("–", texto)
+    nuevo = RE_GUION_PALABRA.sub(r"\1– \2", nuevo)
 
-    return re.sub(r'([A-Za-zÀ-Üà-ü]+)–(\W)', r'\1 –\2', nuevo)
+    return RE_PALABRA_GUION.sub(r"\1 –\2", nuevo)
 
 
 def separar_numeros(texto):
@@ -73,9 +84,101 @@ def separar_numeros(texto):
     str
         Texto con números separados de palabras.
     """
-    nuevo = re.sub(r'(\d+)([A-Za-zÀ-Üà-ü]{2,}?|\()', r'\1 \2', texto)
+    nuevo = RE_NUMERO_LETRAS.sub(r"\1 \2", texto)
+
+    return RE_LETRAS_NUMERO.sub(r"\1 \2", nuevo)
+
+
+class Limpiador:
+    """Limpieza de texto extraído con expresiones compiladas una sola vez.
+
+    Produce el mismo resultado que `limpiar_extraccion`.
+
+    Parameters
+    ----------
+    chars : int
+        Mínimo número de caracteres en una línea de texto.
+    basura : Iterable
+        Caracteres a eliminar.
+    """
+
+    def __init__(self, chars=0, basura=None):
+        """Opcional: chars, basura."""
+        self.chars = chars
+        self.basura = basura
+
+        self.re_basura = re.compile(f"[{''.join(basura)}]") if basura else None
+
+    def __repr__(self):
+        return f"Limpiador (chars={self.chars}, basura={self.basura})."
+
+    def __call__(self, texto):
+        return self.limpiar(texto)
+
+    def limpiar(self, texto):
+        """Limpieza de texto extraido.
+
+        Omite las sustituciones que no pueden aplicar al texto.
+
+        Parameters
+        ----------
+        texto : str
 
-    return re.sub(r'([A-Za-zÀ-Üà-ü]{2,}?|\))(\d+)', r'\1 \2', nuevo)
+        Returns
+        -------
+        str
+           Texto procesado.
+        """
+        limpio = texto
+        if "-\n" in limpio:
+            limpio = RE_FRAGMENTOS.sub("", limpio)
+
+        if "–" in limpio or "—" in limpio:
+            limpio = separar_guiones(limpio)
+
+        limpio = RE_NUMERO_LETRAS.sub(r"\1 \2", limpio)
+        limpio = RE_LETRAS_NUMERO.sub(r"\1 \2", limpio)
+
+        if self.chars:
+            limpio = filtrar_cortas(limpio, chars=self.chars)
+
+        if self.re_basura:
+            limpio = self.re_basura.sub("", limpio)
+
+        return " ".join(limpio.split())
+
+    def limpiar_lote(self, textos):
+        """Limpieza de varios textos extraidos.
+
+        Parameters
+        ----------
+        textos : Iterable[str]
+
+        Returns
+        -------
+        list[str]
+           Textos procesados.
+        """
+        limpiar = self.limpiar
+        return [limpiar(texto) for texto in textos]
+
+
+@lru_cache(maxsize=32)
+def crear_limpiador(chars=0, basura=None):
+    """Limpiador reutilizable para una configuración.
+
+    Parameters
+    ----------
+    chars : int
+        Mínimo número de caracteres en una línea de texto.
+    basura : tuple, optional
+        Caracteres a eliminar.
+
+    Returns
+    -------
+    banrep.preprocesos.Limpiador
+    """
+    return Limpiador(chars=chars, basura=basura)
 
 
 def limpiar_extraccion(texto, chars=0, basura=None):
@@ -94,14 +197,6 @@ def limpiar_extraccion(texto, chars=0, basura=None):
     str
        Texto procesado.
     """
-    limpio = unir_fragmentos(texto)
-    limpio = separar_guiones(limpio)
-    limpio = separar_numeros(limpio)
-
-    if chars:
-        limpio = filtrar_cortas(limpio, chars=chars)
-
-    if basura:
-        limpio = re.sub(f"[{''.join(basura)}]", '', limpio)
+    basura = tuple(basura) if basura else None
 
-    return ' '.join(limpio.split())
+    return crear_limpiador(chars=chars, basura=basura).limpiar(texto)
@@ -2,6 +2,7 @@
 """Módulo para tabulaciones de lingüística y transformación de texto."""
 
 import pandas as pd
+from pandas.api.types import union_categoricals
 
 
 def df_tokens(frases, ng=False):
@@ -34,6 +35,40 @@ def df_tokens(frases, ng=False):
     return pd.concat(dfs, ignore_index=True)
 
 
+def df_lotes(lotes):
+    """DataFrame de tokens a partir de lotes columnares.
+
+    Parameters
+    ----------
+    lotes : Iterable[dict (str: np.ndarray | pd.Categorical) | pyarrow.RecordBatch]
+        Lotes de anotaciones lingüísticas, ver `Frases.lotes`.
+
+    Returns
+    -------
+    pd.DataFrame
+        Anotaciones lingüísticas de cada token, strings como categorías.
+    """
+    dfs = []
+    for lote in lotes:
+        if hasattr(lote, "to_pandas"):
+            dfs.append(lote.to_pandas())
+        else:
+            dfs.append(pd.DataFrame(lote, copy=False))
+
+    if len(dfs) == 1:
+        return dfs[0]
+
+    columnas = {}
+    for col in dfs[0].columns:
+        valores = [df[col] for df in dfs]
+        if isinstance(valores[0].dtype, pd.CategoricalDtype):
+            columnas[col] = union_categoricals(valores)
+        else:
+            columnas[col] = pd.concat(valores, ignore_index=True)
+
+    return pd.DataFrame(columnas)
+
+
 def df_frases(frases):
     """DataFrame de frases.
 
@@ -1,10 +1,55 @@
 # coding: utf-8
 """Modulo para pruebas de extraccion."""
-from banrep.extraccion import extraer_info, extraer_archivos, main
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+
+from banrep.extraccion import (
+    ClienteTika,
+    extraer_info,
+    extraer_todos,
+    procesar_todos,
+    procesar_xhtml,
+    main,
+)
 
 import pytest
 
 
+class TikaFalso(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    conexiones = set()
+
+    def do_PUT(self):
+        self.conexiones.add(self.client_address)
+        data = self.rfile.read(int(self.headers["Content-Length"]))
+        content = f"<html><body><p>{data.decode('utf-8')}</p><p> </p></body></html>"
+        body = json.dumps([{"X-TIKA:content": content, "Content-Type": "text/plain"}])
+        body = body.encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def tika():
+    TikaFalso.conexiones = set()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), TikaFalso)
+    hilo = threading.Thread(target=server.serve_forever, daemon=True)
+    hilo.start()
+
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+
+    server.shutdown()
+    server.server_close()
+
+
 def test_extraer_info():
     texto, metadata = extraer_info("bla.pdf")
     assert texto == None
@@ -15,19 +60,153 @@ def test_extraer_info_arg0():
         texto, metadata = extraer_info()
 
 
-def test_extraer_archivos_arg0():
+def test_extraer_todos_arg0():
     with pytest.raises(TypeError):
-        n = extraer_archivos()
+        n = extraer_todos()
 
 
-def test_extraer_archivos_arg1(tmp_path):
+def test_extraer_todos_arg1(tmp_path):
     with pytest.raises(TypeError):
-        n = extraer_archivos(tmp_path)
+        n = extraer_todos(tmp_path)
+
+
+def test_extraer_todos(tmp_path):
+    n = extraer_todos(tmp_path, tmp_path.joinpath("textos"))
+    assert n == 0
 
 
-def test_extraer_archivos(tmp_path):
-    n = extraer_archivos(tmp_path, "textos")
+def test_extraer_todos_workers(tmp_path):
+    fallas = dict()
+    n = extraer_todos(tmp_path, tmp_path.joinpath("textos"), workers=2, fallas=fallas)
     assert n == 0
+    assert fallas == {}
+
+
+def test_procesar_todos_fallas(tmp_path):
+    rutas = [tmp_path.joinpath(f"bla{i}.pdf") for i in range(3)]
+    resultados = list(procesar_todos(rutas, workers=2))
+
+    assert len(resultados) == 3
+    assert all(motivo for _, _, motivo in resultados)
+
+
+def test_procesar_xhtml_streaming():
+    content = """<?xml version="1.0" encoding="UTF-8"?>
+    <html xmlns="http://www.w3.org/1999/xhtml"><head><title>T</title></head>
+    <body><div class="page"><p>Hola <b>mundo</b> 2020crecimiento </p><p/>
+    <p>  </p><p>Línea<br/>frag-\nmento <!-- nota --> fin</p></div>
+    <table><tr><td><p>celda</p></td></tr></table><p>Últi<i> ma </i></p></body></html>
+    """
+    esperado = procesar_xhtml(content, chars=3, basura=["#"])
+
+    assert esperado
+    assert procesar_xhtml(content, chars=3, basura=["#"], streaming=True) == esperado
+    assert procesar_xhtml("", streaming=True) == ""
+
+    content = "<html><body><p>a<script>var x=1;</script>b</p>"
+    content += "<p>c<style>p {color: red;}</style>d</p></body></html>"
+    assert procesar_xhtml(content) == "ab\ncd\n"
+    assert procesar_xhtml(content, streaming=True) == "ab\ncd\n"
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        "<p>a<span><p>b</p></span>c</p><p>d</p>",
+        "<p>a<span><p>b<i><p>c</p></i></p>d</span>e</p>",
+        "<p>x<template>t</template>y</p><template><p>z</p></template>",
+        "<p>x<span><template>t<p>w</p></template></span>y</p>",
+    ],
+)
+def test_procesar_xhtml_streaming_anidados(body):
+    content = f"<html><body>{body}</body></html>"
+
+    assert procesar_xhtml(content, streaming=True) == procesar_xhtml(content)
+
+
+def test_cliente_tika(tika, tmp_path):
+    archivo = tmp_path.joinpath("doc.txt")
+    archivo.write_text("Hola mundo", encoding="utf-8")
+
+    with ClienteTika(tika) as cliente:
+        content, metadata = cliente.extraer(archivo)
+
+    assert "<p>Hola mundo</p>" in content
+    assert metadata["Content-Type"] == "text/plain"
+
+
+def test_extraer_todos_cliente(tika, tmp_path):
+    dirin = tmp_path.joinpath("docs")
+    dirin.mkdir()
+    for i in range(5):
+        dirin.joinpath(f"doc{i}.txt").write_text(f"Documento {i}", encoding="utf-8")
+
+    dirout = tmp_path.joinpath("textos")
+    with ClienteTika(tika, concurrencia=1) as cliente:
+        n = extraer_todos(dirin, dirout, cliente=cliente)
+
+    assert n == 5
+    assert dirout.joinpath("doc3.txt").read_text(encoding="utf-8") == "Documento 3\n"
+    assert len(TikaFalso.conexiones) == 1
+
+
+def test_extraer_todos_manifiesto(tika, tmp_path):
+    dirin = tmp_path.joinpath("docs")
+    dirin.mkdir()
+    for i in range(3):
+        dirin.joinpath(f"doc{i}.txt").write_text(f"Documento {i}", encoding="utf-8")
+
+    dirout = tmp_path.joinpath("textos")
+    with ClienteTika(tika) as cliente:
+        assert extraer_todos(dirin, dirout, cliente=cliente) == 3
+        assert extraer_todos(dirin, dirout, cliente=cliente) == 0
+
+        dirin.joinpath("doc1.txt").write_text("Documento uno", encoding="utf-8")
+        dirin.joinpath("doc2.txt").unlink()
+        assert extraer_todos(dirin, dirout, cliente=cliente) == 1
+        assert dirout.joinpath("doc2.txt").exists()
+        assert extraer_todos(dirin, dirout, cliente=cliente, podar=True) == 0
+
+    assert dirout.joinpath("doc1.txt").read_text(encoding="utf-8") == "Documento uno\n"
+    assert not dirout.joinpath("doc2.txt").exists()
+    assert not dirout.joinpath("metadata", "doc2.json").exists()
+
+
+def test_extraer_todos_dirin_compartido(tika, tmp_path):
+    dirout = tmp_path.joinpath("textos")
+    for nombre in ("a", "b"):
+        dirin = tmp_path.joinpath(nombre)
+        dirin.mkdir()
+        dirin.joinpath(f"informe-{nombre}.txt").write_text(nombre, encoding="utf-8")
+        dirin.joinpath("comun.txt").write_text(nombre, encoding="utf-8")
+
+    fallas = dict()
+    with ClienteTika(tika) as cliente:
+        assert extraer_todos(tmp_path.joinpath("a"), dirout, cliente=cliente) == 2
+        n = extraer_todos(
+            tmp_path.joinpath("b"), dirout, cliente=cliente, fallas=fallas, podar=True
+        )
+
+    assert n == 1
+    assert list(fallas) == [str(tmp_path.joinpath("b", "comun.txt"))]
+    assert dirout.joinpath("informe-a.txt").exists()
+    assert dirout.joinpath("informe-b.txt").exists()
+    assert dirout.joinpath("comun.txt").read_text(encoding="utf-8") == "a\n"
+
+
+def test_extraer_todos_misma_salida(tika, tmp_path):
+    dirin = tmp_path.joinpath("docs")
+    dirin.mkdir()
+    dirin.joinpath("doc.txt").write_text("texto", encoding="utf-8")
+    dirin.joinpath("doc.html").write_text("html", encoding="utf-8")
+
+    fallas = dict()
+    dirout = tmp_path.joinpath("textos")
+    with ClienteTika(tika) as cliente:
+        assert extraer_todos(dirin, dirout, cliente=cliente, fallas=fallas) == 1
+
+    assert len(fallas) == 1
+    assert dirout.joinpath("doc.txt").exists()
 
 
 def test_main_noargs():
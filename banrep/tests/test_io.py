@@ -1,7 +1,20 @@
 # coding: utf-8
 """Modulo para pruebas de io."""
 
-from banrep.io import leer_texto, guardar_texto, iterar_registros
+import math
+
+import pandas as pd
+
+from banrep.io import (
+    Datos,
+    Registros,
+    Textos,
+    leer_texto,
+    guardar_texto,
+    iterar_rutas,
+    leer_jsonl,
+    guardar_jsonl,
+)
 
 import pytest
 
@@ -35,7 +48,7 @@ def test_iterar_textos(tmp_path):
         archivo = tmp_path.joinpath("filas.txt")
         guardar_texto(texto, archivo)
 
-        iterable = iterar_registros(tmp_path)
+        iterable = iterar_rutas(tmp_path)
         assert len(list(iterable)) == 1
 
 
@@ -45,10 +58,110 @@ def test_iterar_registros_aleatorios(tmp_path):
                 archivo = tmp_path.joinpath(f"filas{i}.txt")
                 guardar_texto(texto, archivo)
 
-        aleatorios = iterar_registros(tmp_path, aleatorio=True)
+        aleatorios = iterar_rutas(tmp_path, aleatorio=True)
 
-        assert list(aleatorios) != list(iterar_registros(tmp_path))
+        assert list(aleatorios) != list(iterar_rutas(tmp_path))
 
 def test_iterar_registros_arg0():
         with pytest.raises(TypeError):
-                iterable = iterar_registros()
+                iterable = iterar_rutas()
+
+
+def test_textos_workers(tmp_path):
+    for i in range(20):
+        texto = f"Archivo {i}\nCorto\n\nSegundo párrafo del archivo {i}"
+        guardar_texto(texto, tmp_path.joinpath(f"doc{i:02}.txt"))
+    guardar_texto("", tmp_path.joinpath("vacio.txt"))
+
+    serial = list(Textos(tmp_path, chars=5))
+    paralelo = Textos(tmp_path, chars=5, workers=4, prefetch=3)
+
+    assert list(paralelo) == serial
+    assert len(serial) == 40
+    assert (paralelo.n, paralelo.nprg) == (20, 40)
+
+
+@pytest.mark.parametrize("nombre", ["frases.jsonl", "frases.jsonl.gz"])
+def test_guardar_jsonl(tmp_path, nombre):
+    objs = [{"text": f"Frase {i}", "tokens": ["á", i], "meta": {}} for i in range(10)]
+    archivo = tmp_path.joinpath(nombre)
+
+    assert guardar_jsonl(archivo, objs) == [archivo]
+    assert list(leer_jsonl(archivo)) == objs
+
+
+def test_guardar_jsonl_nan(tmp_path):
+    archivo = tmp_path.joinpath("frases.jsonl")
+    guardar_jsonl(archivo, [{"valor": float("nan"), "n": 1}])
+
+    (obj,) = leer_jsonl(archivo)
+    assert obj["n"] == 1
+    assert math.isnan(obj["valor"])
+
+
+def test_guardar_jsonl_fragmentos(tmp_path):
+    objs = [{"id": i} for i in range(25)]
+    archivo = tmp_path.joinpath("frases.jsonl.gz")
+
+    rutas = guardar_jsonl(archivo, objs, max_registros=10)
+    assert [r.name for r in rutas] == [
+        "frases-00000.jsonl.gz",
+        "frases-00001.jsonl.gz",
+        "frases-00002.jsonl.gz",
+    ]
+    assert list(leer_jsonl(archivo)) == objs
+    assert list(leer_jsonl(rutas[2])) == objs[20:]
+
+    guardar_jsonl(archivo, objs[:5], max_registros=10)
+    assert list(leer_jsonl(archivo)) == objs[:5]
+
+    guardar_jsonl(archivo, objs[:3])
+    assert list(leer_jsonl(archivo)) == objs[:3]
+    assert list(tmp_path.iterdir()) == [archivo]
+
+    guardar_jsonl(archivo, objs[:5], max_registros=2)
+    assert list(leer_jsonl(archivo)) == objs[:5]
+    assert not archivo.exists()
+
+
+def test_registros_chunksize(tmp_path):
+    filas = ["id,texto,fuente,otra"]
+    filas += [f"{i},Texto número {i},f{i % 3},x" for i in range(7)]
+    filas += ["7,,f1,x"]
+    tmp_path.joinpath("datos.csv").write_text("\n".join(filas), encoding="utf-8")
+
+    completo = list(Registros(tmp_path, "texto", ["id", "fuente"]))
+    partes = Registros(tmp_path, "texto", ["id", "fuente"], chunksize=3)
+
+    assert list(partes) == completo
+    assert len(completo) == 7
+    assert completo[2] == ("Texto número 2", {"id": 2, "fuente": "f2"})
+    assert len(partes) == 1
+
+
+def test_datos_lotes():
+    df = pd.DataFrame(
+        {
+            "texto": [f"Texto\nlínea {i}" for i in range(5)],
+            "fecha publicación": pd.date_range("2020-01-01", periods=5),
+            "id": range(5),
+        }
+    )
+    datos = Datos(df, "texto", ["id", "fecha publicación"], chars=5, tamano=2)
+    lotes = list(datos.lotes())
+
+    assert [len(textos) for textos, _ in lotes] == [2, 2, 1]
+    assert list(datos)[3] == (
+        "línea 3\n",
+        {"id": 3, "fecha publicación": pd.Timestamp("2020-01-04")},
+    )
+    assert list(Datos(df, "texto", [])) == [(t, {}) for t in df["texto"]]
+
+
+def test_datos_chars_nulos():
+    df = pd.DataFrame({"texto": ["Esta\nEsta sigue\nNo.", None, "Corta"]})
+    textos = [texto for texto, _ in Datos(df, "texto", [], chars=5)]
+
+    assert textos[0] == "Esta sigue\n"
+    assert pd.isna(textos[1])
+    assert textos[2] == ""
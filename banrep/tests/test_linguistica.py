@@ -0,0 +1,240 @@
+# coding: utf-8
+"""Modulo para pruebas de procesamiento lingüístico."""
+
+import pickle
+
+import pytest
+
+spacy = pytest.importorskip("spacy")
+
+from banrep.linguistica import (  # noqa: E402
+    CacheDocs,
+    Cumplimiento,
+    FiltroTokens,
+    Frases,
+    Presencia,
+)
+
+
+def crear_parser(vistos):
+    """Parser de prueba: una frase por documento, registra si ya había frases."""
+
+    def parser(doc):
+        vistos.append(any(t.is_sent_start for t in doc[1:]))
+        for token in doc[1:]:
+            token.is_sent_start = False
+
+        return doc
+
+    return parser
+
+
+def test_frases_sentencizer_no_modifica_pipeline():
+    nlp = spacy.blank("es")
+    vistos = []
+    nlp.add_pipe(crear_parser(vistos), name="parser")
+    texto = "Hola a todos. Chao a todos."
+
+    sin_parser = Frases(nlp, [(texto, {"doc": "a"})], attrs=["lower_"])
+    assert [f["text"] for f in sin_parser] == ["Hola a todos.", "Chao a todos."]
+    assert "sentencizer" not in nlp.pipe_names
+    assert vistos == []
+
+    con_parser = Frases(nlp, [(texto, {"doc": "a"})])
+    assert con_parser.sentencizer is None
+    assert [f["text"] for f in con_parser] == [texto]
+    assert vistos == [False]
+
+
+def contar_anotados(monkeypatch, nlp):
+    """Registra textos que el pipeline anota."""
+    anotados = []
+    pipe = nlp.pipe
+
+    def contador(textos, **kwargs):
+        textos = list(textos)
+        anotados.extend(textos)
+        return pipe(textos, **kwargs)
+
+    monkeypatch.setattr(nlp, "pipe", contador)
+
+    return anotados
+
+
+DATOS = [
+    ("La tasa sube. El banco baja.", {"doc": "a"}),
+    ("Otra frase del banco.", {"doc": "b"}),
+]
+
+
+def test_cache_docs_acierta_y_falla(tmp_path, monkeypatch):
+    nlp = spacy.blank("es")
+    anotados = contar_anotados(monkeypatch, nlp)
+
+    esperadas = list(Frases(nlp, DATOS, attrs=["lower_"], cache=tmp_path))
+    assert anotados == [texto for texto, _ in DATOS]
+
+    nuevo = ("Un texto nuevo.", {"doc": "c"})
+    frases = Frases(nlp, DATOS + [nuevo], attrs=["lower_"], cache=tmp_path)
+    obtenidas = list(frases)
+
+    assert anotados[len(DATOS) :] == [nuevo[0]]
+    assert obtenidas[: len(esperadas)] == esperadas
+    assert len(frases.cache) == 3
+    assert len(CacheDocs(tmp_path, nlp, frases.desactivar)) == 3
+
+
+def test_cache_docs_firma_cambia_con_pipeline(tmp_path):
+    nlp = spacy.blank("es")
+    frases = Frases(nlp, DATOS, attrs=["lower_"], cache=tmp_path)
+    list(frases)
+
+    nlp.add_pipe(lambda doc: doc, name="otro")
+    cache = CacheDocs(tmp_path, nlp, frases.desactivar)
+
+    assert cache.firma != frases.cache.firma
+    assert len(cache) == 0
+
+
+def test_cache_docs_aplica_cumplimiento_y_presencia(tmp_path, monkeypatch):
+    nlp = spacy.blank("es")
+    attrs = ["lower_"]
+    grupos = {"politica": {"tasa"}}
+    list(Frases(nlp, DATOS, attrs=attrs, grupos=grupos, cache=tmp_path))
+
+    anotados = contar_anotados(monkeypatch, nlp)
+    filtros = {"lower_": ["la"]}
+    grupos = {"politica": {"banco"}}
+    frases = Frases(
+        nlp, DATOS, filtros=filtros, grupos=grupos, attrs=attrs, cache=tmp_path
+    )
+    tokens = [t for frase in frases for t in frase["tokens"]]
+
+    assert anotados == []
+    assert "la" not in {t["lower_"] for t in tokens}
+    assert {t["lower_"] for t in tokens if t["politica"]} == {"banco"}
+
+
+def test_presencia_igual_a_recorrido_por_grupo():
+    nlp = spacy.blank("es")
+    grupos = {
+        "politica": {"tasa", "Banco", "inflación"},
+        "mercado": {"tasa", "dólar", "banco central"},
+    }
+    texto = "La Tasa del banco central y el BANCO suben con la inflación."
+    doc = Presencia(nlp, grupos)(nlp(texto))
+
+    for token in doc:
+        for grupo, palabras in grupos.items():
+            esperado = token.lower_ in palabras
+            if grupo == "mercado" and token.i in (3, 4):
+                esperado = True
+
+            assert token._.get(grupo) == esperado, (token.text, grupo)
+
+
+def test_presencia_valores_no_str():
+    nlp = spacy.blank("es")
+    grupos = {"cifras": {float("nan"), 2020, "tasa"}}
+    doc = Presencia(nlp, grupos)(nlp("La tasa de 2020 sube ."))
+
+    assert [t.text for t in doc if t._.get("cifras")] == ["tasa", "2020"]
+
+
+def token_cumple_anterior(filtros, token):
+    """Evaluación de filtros token a token, antes de FiltroTokens."""
+    if not filtros:
+        return True
+
+    if filtros.get("is_alpha") and not token.is_alpha:
+        return False
+
+    attr = ["lower_", "pos_", "dep_", "ent_type_"]
+    if not all(getattr(token, a) not in filtros.get(a, list()) for a in attr):
+        return False
+
+    chars = filtros.get("chars", 0)
+    if chars:
+        return len(token) > chars
+
+    return True
+
+
+@pytest.mark.parametrize(
+    "filtros",
+    [
+        None,
+        {"is_alpha": True},
+        {"lower_": ["la", "Tasa"], "chars": 3},
+        {"pos_": ["DET"], "dep_": ["punct"]},
+        {"ent_type_": [""]},
+        {"ent_type_": ["ORG"], "is_alpha": True, "chars": 2},
+    ],
+)
+def test_filtro_tokens_igual_a_token_cumple(filtros):
+    nlp = spacy.blank("es")
+    doc = nlp("La tasa del Banco subió 25 % .")
+    anotaciones = [
+        ("DET", "det", ""),
+        ("NOUN", "nsubj", ""),
+        ("ADP", "case", ""),
+        ("PROPN", "nmod", "ORG"),
+        ("VERB", "ROOT", ""),
+        ("NUM", "obj", ""),
+        ("SYM", "punct", ""),
+        ("PUNCT", "punct", ""),
+    ]
+    assert len(doc) == len(anotaciones)
+    for token, (pos, dep, ent) in zip(doc, anotaciones):
+        token.pos_ = pos
+        token.dep_ = dep
+        token.ent_type_ = ent
+
+    filtro = FiltroTokens(filtros, nlp.vocab)
+    for token in doc:
+        assert filtro(token) == token_cumple_anterior(filtros, token), token.text
+
+
+def extensiones(doc, nombres):
+    """Valores de extensiones de cada token."""
+    return [[token._.get(n) for n in nombres] for token in doc]
+
+
+def test_componentes_serializables():
+    nlp = spacy.blank("es")
+    grupos = {"politica": {"tasa", "banco central"}}
+    filtros = {"lower_": ["la"], "chars": 2}
+    texto = "La tasa del banco central sube."
+
+    for componente in (Cumplimiento(nlp, filtros), Presencia(nlp, grupos)):
+        copia = pickle.loads(pickle.dumps(componente))
+        nombres = ["ok_token", *grupos]
+
+        esperado = extensiones(componente(nlp(texto)), nombres)
+        assert extensiones(copia(nlp(texto)), nombres) == esperado
+
+
+def test_frases_n_process_igual_a_serial():
+    datos = [
+        (f"La tasa {i} sube. El banco central baja.", {"doc": i}) for i in range(6)
+    ]
+    config = dict(
+        filtros={"lower_": ["la"]},
+        grupos={"politica": {"tasa", "banco central"}},
+        attrs=["lower_"],
+        batch_size=2,
+    )
+
+    serial = list(Frases(spacy.blank("es"), datos, **config))
+    paralelo = list(Frases(spacy.blank("es"), datos, n_process=2, **config))
+
+    ids = [f["meta"]["id_sent"] for f in serial]
+    tokens = [t for f in paralelo for t in f["tokens"]]
+
+    assert [f["meta"]["id_sent"] for f in paralelo] == ids
+    assert {t["lower_"] for t in tokens if t["politica"]} == {
+        "tasa",
+        "banco",
+        "central",
+    }
+    assert paralelo == serial
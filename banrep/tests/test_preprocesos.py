@@ -1,16 +1,62 @@
 # coding: utf-8
 """Modulo para pruebas de preprocesos."""
 
-from banrep.preprocesos import filtrar_cortas
+import re
+
+from banrep.preprocesos import (
+    Limpiador,
+    filtrar_cortas,
+    limpiar_extraccion,
+)
 
 import pytest
 
+TEXTOS = [
+    "La infla-\n\nción de 2020fue 3,8%(anual) en Bogotá2 y—según—el banco–dice",
+    "Título\ncorto\nUna línea bastante larga con – guiones —y números 12ab",
+    "  Sin  cambios  ###  ",
+    "",
+]
+
 
 def test_filtrar_cortas():
     texto = "Esta\nEsta sigue\nNo."
     chars = 5
     assert filtrar_cortas(texto, chars) == "Esta sigue\n"
 
+
+def test_filtrar_cortas_vacio():
+    assert filtrar_cortas("No.\nSi", 5) == ""
+    assert filtrar_cortas("Esta sigue\r\nOtra más larga", 5) == (
+        "Esta sigue\nOtra más larga\n"
+    )
+
+
 def test_filtrar_cortas_arg0():
     with pytest.raises(TypeError):
         filtrar_cortas()
+
+
+def limpiar_referencia(texto, chars=0, basura=None):
+    letras = "A-Za-zÀ-Üà-ü"
+    limpio = re.sub(r"-\n+", "", texto)
+    limpio = re.sub(r"[—–]{1,}", "–", limpio)
+    limpio = re.sub(rf"(\W)–([{letras}]+)", r"\1– \2", limpio)
+    limpio = re.sub(rf"([{letras}]+)–(\W)", r"\1 –\2", limpio)
+    limpio = re.sub(rf"(\d+)([{letras}]{{2,}}?|\()", r"\1 \2", limpio)
+    limpio = re.sub(rf"([{letras}]{{2,}}?|\))(\d+)", r"\1 \2", limpio)
+    if chars:
+        limpio = filtrar_cortas(limpio, chars=chars)
+    if basura:
+        limpio = re.sub(f"[{''.join(basura)}]", "", limpio)
+
+    return " ".join(limpio.split())
+
+
+@pytest.mark.parametrize("chars, basura", [(0, None), (6, ["#", "%"]), (0, "\\*#")])
+def test_limpiador(chars, basura):
+    esperados = [limpiar_referencia(t, chars=chars, basura=basura) for t in TEXTOS]
+    limpiador = Limpiador(chars=chars, basura=basura)
+
+    assert limpiador.limpiar_lote(TEXTOS) == esperados
+    assert [limpiar_extraccion(t, chars, basura) for t in TEXTOS] == esperados
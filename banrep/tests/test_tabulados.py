@@ -0,0 +1,40 @@
+# coding: utf-8
+"""Modulo para pruebas de tabulados."""
+
+import numpy as np
+import pandas as pd
+
+from banrep.tabulados import df_frases, df_lotes
+
+
+def crear_lote(ids, tokens, fuente):
+    codigos, categorias = pd.factorize(np.array(tokens, dtype=object))
+    return {
+        "id_sent": np.array(ids),
+        "lower_": pd.Categorical.from_codes(codigos, categories=list(categorias)),
+        "fuente": pd.Categorical([fuente] * len(ids)),
+    }
+
+
+def test_df_lotes_une_categorias():
+    lotes = [
+        crear_lote([1, 1, 2], ["la", "tasa", "sube"], "a.txt"),
+        crear_lote([3, 3], ["tasa", "baja"], "b.txt"),
+    ]
+    df = df_lotes(lotes)
+
+    assert df["id_sent"].tolist() == [1, 1, 2, 3, 3]
+    assert df["lower_"].tolist() == ["la", "tasa", "sube", "tasa", "baja"]
+    assert isinstance(df["lower_"].dtype, pd.CategoricalDtype)
+    assert set(df["fuente"].cat.categories) == {"a.txt", "b.txt"}
+
+
+def test_df_frases():
+    frases = [
+        {"text": "la tasa sube", "meta": {"fuente": "a.txt"}},
+        {"text": "la tasa baja", "meta": {"fuente": "b.txt"}},
+    ]
+    df = df_frases(frases)
+
+    assert df["text"].tolist() == ["la tasa sube", "la tasa baja"]
+    assert df["fuente"].tolist() == ["a.txt", "b.txt"]
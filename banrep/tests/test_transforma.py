@@ -0,0 +1,317 @@
+# coding: utf-8
+"""Modulo para pruebas de transformación de texto."""
+
+from gensim.corpora import Dictionary
+from gensim.models import CoherenceModel
+
+from banrep.transforma import (
+    Bags,
+    CorpusBow,
+    EvaluadorCoherencia,
+    NgramFrases,
+    Topicos,
+    calcular_coherencia,
+    crear_lda,
+)
+
+import pytest
+
+PALABRAS = ["la", "tasa", "de", "interés", "banco", "central", "sube", "baja"]
+
+
+class FrasesContadas:
+    """Frases que cuentan cuántas veces son recorridas."""
+
+    def __init__(self, n=300):
+        self.n = n
+        self.pasadas = 0
+
+    def __iter__(self):
+        self.pasadas += 1
+        for i in range(self.n):
+            palabras = ["banco", "central"] + PALABRAS[i % 4 : i % 4 + 3]
+            tokens = [{"lower_": p, "text": p.title()} for p in palabras]
+            yield dict(text=" ".join(palabras), tokens=tokens, meta={"doc": i // 10})
+
+
+@pytest.mark.parametrize("materializar", [True, "frases.jsonl.gz"])
+def test_ngramfrases_materializar(tmp_path, materializar):
+    if isinstance(materializar, str):
+        materializar = tmp_path.joinpath(materializar)
+
+    esperadas = list(NgramFrases(FrasesContadas(), th=0.05))
+
+    frases = FrasesContadas()
+    ngramas = NgramFrases(frases, th=0.05, materializar=materializar)
+    obtenidas = list(ngramas)
+
+    assert frases.pasadas == 1
+    assert obtenidas == esperadas
+    assert any("_" in t for f in obtenidas for t in f["tokens"])
+
+
+def test_ngramfrases_workers_igual_a_serial():
+    serial = NgramFrases(FrasesContadas(), th=0.05)
+    paralelo = NgramFrases(FrasesContadas(), th=0.05, workers=2, tamano=37)
+
+    for nombre in ("bigrams", "trigrams"):
+        esperado = serial.models[nombre].phrasegrams
+        assert paralelo.models[nombre].phrasegrams == esperado
+
+    assert list(paralelo) == list(serial)
+
+
+@pytest.mark.parametrize("materializar", [True, "corpus"])
+def test_bags_materializar(tmp_path, materializar):
+    if isinstance(materializar, str):
+        materializar = tmp_path.joinpath(materializar)
+
+    esperadas = list(Bags(FrasesContadas(), "doc", attr="lower_"))
+
+    frases = FrasesContadas()
+    bags = Bags(frases, "doc", attr="lower_", materializar=materializar)
+
+    assert list(bags) == esperadas
+    assert list(bags.corpus.sparsed()) == [b["sparsed"] for b in esperadas]
+    assert len(bags) == len(esperadas)
+    assert frases.pasadas == 2
+
+
+def test_corpusbow_conserva_tokens_fuera_de_vocab():
+    vocab = Dictionary([["banco", "central"]])
+    docs = [("a", ["banco", "tasa", "banco"]), ("b", ["sube", "central"])]
+    corpus = CorpusBow(docs, vocab)
+
+    assert list(corpus.textos()) == [d for _, d in docs]
+    assert corpus.bow(0) == vocab.doc2bow(docs[0][1])
+    assert corpus.bow(1) == vocab.doc2bow(docs[1][1])
+
+
+def test_topicos_igual_con_corpus_materializado(tmp_path):
+    params = dict(random_state=1, passes=2)
+    kas = [2, 3]
+
+    bags = Bags(FrasesContadas(), "doc", attr="lower_")
+    esperados = [m["score"] for m in Topicos(bags, kas, params)]
+
+    bags = Bags(FrasesContadas(), "doc", attr="lower_", materializar=tmp_path)
+    obtenidos = [m["score"] for m in Topicos(bags, kas, params)]
+
+    assert obtenidos == pytest.approx(esperados)
+
+
+def test_topicos_workers_igual_a_serial():
+    params = dict(random_state=1, passes=2)
+    bags = Bags(FrasesContadas(), "doc", attr="lower_", materializar=True)
+
+    serial = Topicos(bags, [2, 3, 4], params)
+    esperados = [(m["k"], m["score"]) for m in serial]
+
+    paralelo = Topicos(bags, [2, 3, 4], params, workers=2)
+    obtenidos = [(m["k"], m["score"]) for m in paralelo]
+
+    assert [k for k, _ in obtenidos] == [2, 3, 4]
+    assert [s for _, s in obtenidos] == pytest.approx([s for _, s in esperados])
+    assert (paralelo.best, paralelo.score) == (serial.best, pytest.approx(serial.score))
+
+
+class BagsFalsas:
+    """Bags con corpus vacío, para probar búsquedas sin entrenar modelos."""
+
+    vocab = None
+
+    def materializado(self):
+        return CorpusBow([], Dictionary())
+
+
+@pytest.mark.parametrize("estrategia", ["gruesa", "dorada"])
+def test_topicos_buscar_evalua_pocos_k(monkeypatch, estrategia):
+    kas = range(5, 61)
+    topicos = Topicos(BagsFalsas(), kas, params={})
+
+    def modelos_serie(kas, corpus):
+        for k in kas:
+            yield k, None, 1000 - (k - 23) ** 2
+
+    monkeypatch.setattr(topicos, "modelos_serie", modelos_serie)
+    evaluados = [m["k"] for m in topicos.buscar(estrategia=estrategia)]
+
+    assert topicos.best == 23
+    assert len(evaluados) == len(set(evaluados)) == len(topicos.evaluados)
+    assert len(evaluados) < len(kas) // 2
+
+
+def test_topicos_buscar_presupuesto(monkeypatch):
+    topicos = Topicos(BagsFalsas(), range(5, 61), params={})
+
+    def modelos_serie(kas, corpus):
+        for k in kas:
+            yield k, None, float(k)
+
+    monkeypatch.setattr(topicos, "modelos_serie", modelos_serie)
+
+    assert len(list(topicos.buscar(presupuesto=0))) == 0
+    assert topicos.evaluados == {}
+
+
+def test_topicos_modelos_usa_corpus_vacio(monkeypatch):
+    topicos = Topicos(BagsFalsas(), [2, 3], params={})
+    vacio = CorpusBow([], Dictionary())
+    usados = []
+
+    def materializado():
+        raise AssertionError("corpus dado no debe reconstruirse")
+
+    def modelos_serie(kas, corpus):
+        for k in kas:
+            usados.append(corpus)
+            yield k, None, float(k)
+
+    monkeypatch.setattr(topicos.bags, "materializado", materializado)
+    monkeypatch.setattr(topicos, "modelos_serie", modelos_serie)
+    obtenidos = [k for k, _, _ in topicos.modelos([2, 3], corpus=vacio)]
+
+    assert obtenidos == [2, 3]
+    assert all(corpus is vacio for corpus in usados)
+
+
+@pytest.mark.parametrize("max_palabras,procesos", [(0, 1), (1000, 1), (0, 2)])
+def test_evaluador_coherencia_igual_a_coherencemodel(max_palabras, procesos):
+    bags = Bags(FrasesContadas(), "doc", attr="lower_", materializar=True)
+    sparsed = bags.corpus.sparsed()
+    textos = bags.corpus.textos()
+    modelos = [
+        crear_lda(k, sparsed, bags.vocab, dict(random_state=k)) for k in (2, 3, 4)
+    ]
+
+    evaluador = EvaluadorCoherencia(
+        textos, bags.vocab, max_palabras=max_palabras, procesos=procesos
+    )
+    evaluador.preparar(modelos)
+    for modelo in modelos:
+        esperado = calcular_coherencia(modelo, textos, bags.vocab, procesos=1)
+
+        assert evaluador(modelo) == pytest.approx(esperado)
+
+    assert evaluador.conteos == 1
+
+
+def test_evaluador_coherencia_cuenta_palabras_nuevas():
+    bags = Bags(FrasesContadas(), "doc", attr="lower_", materializar=True)
+    textos = bags.corpus.textos()
+    sparsed = bags.corpus.sparsed()
+    modelos = [crear_lda(k, sparsed, bags.vocab, dict(random_state=k)) for k in (2, 3)]
+
+    evaluador = EvaluadorCoherencia(textos, bags.vocab, topn=3, max_palabras=0)
+    primero = evaluador(modelos[0])
+    acumulador = evaluador.cm._accumulator
+
+    assert evaluador(modelos[0]) == primero
+    assert evaluador.cm._accumulator is acumulador
+    assert evaluador.conteos == 1
+
+    palabras = {p for t in evaluador.topicos(modelos[1]) for p in t}
+    nuevas = palabras - {bags.vocab[i] for i in evaluador.relevantes}
+    esperado = CoherenceModel(
+        model=modelos[1], texts=textos, coherence="c_v", topn=3, processes=1
+    ).get_coherence()
+
+    assert evaluador(modelos[1]) == pytest.approx(esperado)
+    assert evaluador.conteos == (2 if nuevas else 1)
+
+
+def test_topicos_carpeta_reanuda(tmp_path, monkeypatch):
+    params = dict(random_state=1, passes=2)
+    bags = Bags(FrasesContadas(), "doc", attr="lower_", materializar=True)
+
+    esperados = {
+        m["k"]: m["score"] for m in Topicos(bags, [2, 3], params, carpeta=tmp_path)
+    }
+
+    topicos = Topicos(bags, [2, 3, 4], params, carpeta=tmp_path)
+    creados = []
+    crear_modelo = topicos.crear_modelo
+
+    def contar(k, sparsed):
+        creados.append(k)
+        return crear_modelo(k, sparsed)
+
+    monkeypatch.setattr(topicos, "crear_modelo", contar)
+    obtenidos = {m["k"]: m["score"] for m in topicos}
+
+    assert creados == [4]
+    assert obtenidos[2] == esperados[2] and obtenidos[3] == esperados[3]
+    assert topicos.leer_puntajes() == obtenidos
+
+
+def test_topicos_carpeta_ignora_otra_configuracion(tmp_path):
+    params = dict(random_state=1, passes=2)
+    bags = Bags(FrasesContadas(), "doc", attr="lower_", materializar=True)
+    list(Topicos(bags, [2], params, carpeta=tmp_path))
+
+    assert Topicos(bags, [2], params, carpeta=tmp_path).leer_puntajes()
+    otros = dict(random_state=2, passes=2)
+    assert Topicos(bags, [2], otros, carpeta=tmp_path).leer_puntajes() == {}
+
+    menos = Bags(FrasesContadas(), "doc", attr="lower_", keep_n=4)
+    assert Topicos(menos, [2], params, carpeta=tmp_path).leer_puntajes() == {}
+
+
+def test_topicos_actualizar(tmp_path):
+    params = dict(random_state=1, passes=2)
+    bags = Bags(FrasesContadas(), "doc", attr="lower_", materializar=True)
+    topicos = Topicos(bags, [2], params, carpeta=tmp_path)
+    list(topicos)
+
+    nuevos = Bags(FrasesContadas(50), "doc", attr="lower_", vocab=bags.vocab)
+    modelo = topicos.actualizar(2, nuevos)
+
+    textos = list(bags.corpus.textos()) + list(nuevos.materializado().textos())
+    esperado = topicos.evaluar(modelo, textos)
+
+    assert topicos.evaluados[2] == pytest.approx(esperado)
+    assert topicos.leer_puntajes() == {2: topicos.evaluados[2]}
+
+    puntajes = [m["score"] for m in Topicos(bags, [2], params, carpeta=tmp_path)]
+    assert puntajes == [topicos.evaluados[2]]
+
+    solo_nuevos = nuevos.materializado().textos()
+    modelo = topicos.actualizar(2, nuevos, textos=solo_nuevos)
+    assert topicos.evaluados[2] == pytest.approx(topicos.evaluar(modelo, solo_nuevos))
+
+
+def test_topicos_actualizar_otro_vocab(tmp_path):
+    params = dict(random_state=1, passes=2)
+    bags = Bags(FrasesContadas(), "doc", attr="lower_", materializar=True)
+    topicos = Topicos(bags, [2], params, carpeta=tmp_path)
+    list(topicos)
+
+    nuevos = Bags(FrasesContadas(50), "doc", attr="lower_", keep_n=4)
+    with pytest.raises(ValueError):
+        topicos.actualizar(2, nuevos)
+
+    assert topicos.leer_puntajes() == topicos.evaluados
+
+
+def test_bags_vocab_workers_igual_a_serial():
+    serial = Bags(FrasesContadas(), "doc", attr="lower_").vocab
+    paralelo = Bags(FrasesContadas(), "doc", attr="lower_", workers=2, tamano=37).vocab
+
+    assert paralelo.token2id == serial.token2id
+    assert paralelo.dfs == serial.dfs
+    assert paralelo.num_docs == serial.num_docs
+
+
+def test_bags_vocab_filtros_y_guardar(tmp_path):
+    bags = Bags(FrasesContadas(), "doc", attr="lower_", no_above=0.9, keep_n=4)
+
+    assert "banco" not in bags.vocab.token2id
+    assert len(bags.vocab) == 4
+
+    archivo = tmp_path.joinpath("vocab.txt.gz")
+    bags.guardar_vocab(archivo)
+    vocab = Bags.cargar_vocab(archivo)
+
+    assert vocab.token2id == bags.vocab.token2id
+    assert vocab.dfs == bags.vocab.dfs
+    assert list(Bags(FrasesContadas(), "doc", attr="lower_", vocab=vocab)) == list(bags)
@@ -1,20 +1,20 @@
 # coding: utf-8
 """Modulo para pruebas de utils."""
-from banrep.utils import crear_directorio, iterar_rutas
+from banrep.io import crear_carpeta, iterar_rutas
 
 import pytest
 
 
-def test_crear_directorio(tmp_path):
+def test_crear_carpeta(tmp_path):
     nombre = tmp_path.joinpath("output")
-    nuevo = crear_directorio(nombre)
+    nuevo = crear_carpeta(nombre)
 
     assert nuevo.parent == tmp_path
 
 
 def test_crear_directorio_arg0():
     with pytest.raises(TypeError):
-        nuevo = crear_directorio()
+        nuevo = crear_carpeta()
 
 
 def test_iterar_rutas(tmp_path):
@@ -24,3 +24,39 @@ def test_iterar_rutas(tmp_path):
 def test_iterar_rutas_arg0():
     with pytest.raises(TypeError):
         todas = iterar_rutas()
+
+
+def crear_arbol(carpeta):
+    for nombre in ["b.txt", "a.txt", "a/z.pdf", "a/b/c.txt", "a.b/x.txt", ".oculto"]:
+        ruta = carpeta.joinpath(nombre)
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        ruta.write_text("x", encoding="utf-8")
+
+
+def test_iterar_rutas_orden(tmp_path):
+    crear_arbol(tmp_path)
+    esperado = sorted(
+        r for r in tmp_path.glob("**/*") if r.is_file() and not r.name.startswith(".")
+    )
+
+    assert list(iterar_rutas(tmp_path, recursivo=True)) == esperado
+    assert [r.name for r in iterar_rutas(tmp_path)] == ["a.txt", "b.txt"]
+
+
+def test_iterar_rutas_exts(tmp_path):
+    crear_arbol(tmp_path)
+    rutas = iterar_rutas(tmp_path, recursivo=True, exts=["pdf", ".txt"])
+
+    assert len(list(rutas)) == 5
+    assert [r.name for r in iterar_rutas(tmp_path, True, exts=["pdf"])] == ["z.pdf"]
+
+
+def test_iterar_rutas_semilla(tmp_path):
+    for i in range(20):
+        tmp_path.joinpath(f"{i:02}.txt").write_text("x", encoding="utf-8")
+
+    a = list(iterar_rutas(tmp_path, aleatorio=True, semilla=1))
+    b = list(iterar_rutas(tmp_path, aleatorio=True, semilla=1))
+
+    assert a == b
+    assert a != list(iterar_rutas(tmp_path))
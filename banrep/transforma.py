@@ -1,18 +1,359 @@
 # coding: utf-8
 """Módulo para crear modelos de transformación de texto."""
 from collections import defaultdict
-from itertools import groupby
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, groupby, islice
+from pathlib import Path
+from tempfile import TemporaryDirectory
+import hashlib
+import json
 import logging
+import math
+import os
+import time
 import warnings
 
+import numpy as np
+from gensim import utils
 from gensim.corpora import Dictionary
 from gensim.models import CoherenceModel
 from gensim.models import Phrases
 from gensim.models.ldamodel import LdaModel
 from gensim.models.phrases import Phraser
 
+from banrep.io import crear_carpeta, guardar_jsonl, leer_jsonl, mapear_ordenado
+
 logger = logging.getLogger(__name__)
 
+# Modelo previo de cada proceso que cuenta n-gramas, ver `fijar_previo`.
+PREVIO = None
+
+
+def fijar_previo(previo):
+    """Fija modelo previo en un proceso, como initializer de un pool.
+
+    El modelo se envía una sola vez a cada proceso, no con cada lote.
+
+    Parameters
+    ----------
+    previo : gensim.models.phrases.Phraser | None
+        Modelo a aplicar antes de contar (bigramas al contar trigramas).
+    """
+    global PREVIO
+    PREVIO = previo
+
+
+def contar_frases(oraciones, th, previo=None):
+    """Cuenta unigramas y bigramas de un lote de oraciones.
+
+    Parameters
+    ----------
+    oraciones : list[list[str]]
+        Tokens de cada oración.
+    th : float
+        Score Threshold para formar n-gramas.
+    previo : gensim.models.phrases.Phraser, optional
+        Modelo a aplicar antes de contar (bigramas al contar trigramas). Si
+        no se da, se usa el fijado en el proceso con `fijar_previo`.
+
+    Returns
+    -------
+    gensim.models.Phrases
+        Modelo con conteos del lote.
+    """
+    previo = PREVIO if previo is None else previo
+    if previo is not None:
+        oraciones = [previo[tokens] for tokens in oraciones]
+
+    return Phrases(oraciones, threshold=th)
+
+
+def unir_frases(modelos):
+    """Une conteos de modelos Phrases entrenados en lotes diferentes.
+
+    Suma conteos como `Phrases.add_vocab`: usa el mayor min_reduce y, si el
+    vocabulario supera max_vocab_size, descarta términos poco frecuentes.
+
+    Parameters
+    ----------
+    modelos : Iterable[gensim.models.Phrases]
+        Modelos con conteos de cada lote.
+
+    Returns
+    -------
+    gensim.models.Phrases
+        Modelo con conteos de todos los lotes.
+    """
+    modelos = iter(modelos)
+    unido = next(modelos)
+
+    for modelo in modelos:
+        unido.corpus_word_count += modelo.corpus_word_count
+        unido.min_reduce = max(unido.min_reduce, modelo.min_reduce)
+
+        vocab = unido.vocab
+        for palabra, conteo in modelo.vocab.items():
+            vocab[palabra] = vocab.get(palabra, 0) + conteo
+
+        if len(vocab) > unido.max_vocab_size:
+            utils.prune_vocab(vocab, unido.min_reduce)
+            unido.min_reduce += 1
+
+    return unido
+
+
+def crear_diccionario(textos, prune_at=2000000):
+    """Crea diccionario de términos de un lote de textos.
+
+    Parameters
+    ----------
+    textos : list[list[str]]
+        Tokens de cada texto.
+    prune_at : int | None, optional
+        Máximo de términos mientras cuenta.
+
+    Returns
+    -------
+    gensim.corpora.Dictionary
+    """
+    return Dictionary(textos, prune_at=prune_at)
+
+
+def unir_diccionarios(vocabs, prune_at=2000000):
+    """Une diccionarios creados en lotes diferentes.
+
+    Suma frecuencias con `Dictionary.merge_with` y, si supera prune_at,
+    conserva solo los términos más frecuentes (como lo hace gensim al contar).
+
+    Parameters
+    ----------
+    vocabs : Iterable[gensim.corpora.Dictionary]
+        Diccionarios de cada lote.
+    prune_at : int | None, optional
+        Máximo de términos mientras une.
+
+    Returns
+    -------
+    gensim.corpora.Dictionary
+        Diccionario con términos de todos los lotes.
+    """
+    unido = Dictionary()
+    for vocab in vocabs:
+        ids = vocab.token2id
+        nuevos = unido.merge_with(vocab).old2new
+
+        if hasattr(unido, "cfs"):
+            for i in ids.values():
+                j = nuevos[i]
+                unido.cfs[j] = unido.cfs.get(j, 0) + vocab.cfs.get(i, 0)
+
+        if prune_at is not None and len(unido) > prune_at:
+            unido.filter_extremes(no_below=0, no_above=1.0, keep_n=prune_at)
+
+    return unido
+
+
+def crear_lda(k, sparsed, vocab, params):
+    """Crea modelo LDA de k tópicos.
+
+    Parameters
+    ----------
+    k : int
+        Número de tópicos a usar en modelo.
+    sparsed : Iterable[list(tuple(int, int))]
+        Bag of Words con id, freq de tokens.
+    vocab : gensim.corpora.Dictionary
+        Vocabulario del corpus.
+    params : dict
+        Parámetros requeridos en modelos LDA.
+
+    Returns
+    -------
+    gensim.models.ldamodel.LdaModel
+        Modelo LDA de k tópicos.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        modelo = LdaModel(sparsed, num_topics=k, id2word=vocab, **params)
+
+    return modelo
+
+
+def calcular_coherencia(modelo, textos, vocab, procesos=-1):
+    """Calcula Coherence Score (c_v) de modelo de tópicos.
+
+    Parameters
+    ----------
+    modelo : gensim.models.ldamodel.LdaModel
+    textos : Iterable (list[str])
+        Palabras de cada documento en un corpus.
+    vocab : gensim.corpora.Dictionary
+        Vocabulario del corpus.
+    procesos : int, optional
+        Procesos a usar en conteos (-1: todos menos uno).
+
+    Returns
+    -------
+    float
+        Coherencia calculada.
+    """
+    cm = CoherenceModel(
+        model=modelo,
+        texts=textos,
+        dictionary=vocab,
+        coherence="c_v",
+        processes=procesos,
+    )
+
+    return cm.get_coherence()
+
+
+class EvaluadorCoherencia:
+    """Coherence Score (c_v) de varios modelos sobre los mismos textos.
+
+    Cuenta co-ocurrencias en ventanas de textos una sola vez para las
+    palabras de todos los modelos a evaluar (ver `preparar`), o para todo el
+    vocabulario si no supera max_palabras, como `CoherenceModel.for_models`
+    de gensim. Cada modelo se evalúa con esos conteos, y solo se vuelve a
+    contar si un modelo tiene palabras por fuera de ese conjunto. Conteos de
+    cada palabra no dependen de las demás palabras contadas, por lo que el
+    score es igual al de un CoherenceModel por modelo.
+
+    Parameters
+    ----------
+    textos : Iterable (list[str])
+        Palabras de cada documento en un corpus, re-iterable.
+    vocab : gensim.corpora.Dictionary
+        Vocabulario del corpus.
+    topn : int, optional
+        Palabras de cada tópico a evaluar.
+    max_palabras : int, optional
+        Tamaño máximo de vocabulario para contarlo completo.
+    procesos : int, optional
+        Procesos a usar en conteos (-1: todos menos uno).
+    """
+
+    def __init__(self, textos, vocab, topn=20, max_palabras=500, procesos=-1):
+        """Requiere: textos, vocab.
+
+        Opcional: topn, max_palabras, procesos.
+        """
+        self.textos = textos
+        self.vocab = vocab
+        self.topn = topn
+        self.max_palabras = max_palabras
+        self.procesos = procesos
+
+        self.relevantes = set()
+
+        self.cm = None
+        self.conteos = 0
+
+    def __len__(self):
+        return len(self.relevantes)
+
+    def __repr__(self):
+        return f"Co-ocurrencias de {self.__len__()} palabras en {self.conteos} conteos."
+
+    def __call__(self, modelo):
+        """Calcula Coherence Score de modelo de tópicos.
+
+        Parameters
+        ----------
+        modelo : gensim.models.ldamodel.LdaModel
+
+        Returns
+        -------
+        float
+            Coherencia calculada.
+        """
+        topicos = self.topicos(modelo)
+        self.preparar([modelo])
+
+        self.cm.topics = topicos
+
+        return self.cm.get_coherence()
+
+    def topicos(self, modelo):
+        """Palabras principales de cada tópico de modelo."""
+        return CoherenceModel.top_topics_as_word_lists(modelo, self.vocab, self.topn)
+
+    def preparar(self, modelos):
+        """Cuenta co-ocurrencias para palabras de modelos, si faltan.
+
+        Parameters
+        ----------
+        modelos : Iterable[gensim.models.ldamodel.LdaModel]
+            Modelos a evaluar.
+        """
+        if len(self.vocab) <= self.max_palabras:
+            palabras = list(self.vocab.token2id)
+        else:
+            palabras = [p for m in modelos for t in self.topicos(m) for p in t]
+
+        relevantes = {self.vocab.token2id[p] for p in palabras}
+        if self.cm is not None and relevantes <= self.relevantes:
+            return
+
+        relevantes |= self.relevantes
+        self.contar(relevantes)
+
+    def contar(self, relevantes):
+        """Cuenta co-ocurrencias de palabras relevantes en textos.
+
+        Parameters
+        ----------
+        relevantes : set[int]
+            Ids de palabras a contar.
+        """
+        palabras = [self.vocab[i] for i in sorted(relevantes)]
+
+        self.cm = CoherenceModel(
+            topics=[palabras],
+            texts=self.textos,
+            dictionary=self.vocab,
+            coherence="c_v",
+            topn=len(palabras),
+            processes=self.procesos,
+        )
+        self.cm.estimate_probabilities()
+        self.cm.topn = min(self.topn, len(palabras))
+
+        self.relevantes = relevantes
+        self.conteos += 1
+
+        logger.info(f"{self.__repr__()}")
+
+
+def modelar_k(k, carpeta, vocab, params):
+    """Crea y evalúa modelo LDA de k tópicos en un proceso independiente.
+
+    Lee el corpus con memory-map, por lo que procesos comparten sus páginas
+    en vez de recibir una copia serializada.
+
+    Parameters
+    ----------
+    k : int
+        Número de tópicos a usar en modelo.
+    carpeta : str | Path
+        Directorio de CorpusBow guardado.
+    vocab : gensim.corpora.Dictionary
+        Vocabulario del corpus.
+    params : dict
+        Parámetros requeridos en modelos LDA.
+
+    Returns
+    -------
+    tuple (int, gensim.models.ldamodel.LdaModel, float)
+        k, modelo y Coherence Score.
+    """
+    corpus = CorpusBow(carpeta=carpeta)
+    modelo = crear_lda(k, corpus.sparsed(), vocab, params)
+    score = calcular_coherencia(modelo, corpus.textos(), vocab, procesos=1)
+
+    return k, modelo, score
+
 
 class NgramFrases:
     """Info de frases incluyendo n-gramas.
@@ -26,6 +367,14 @@ class NgramFrases:
     th : float
         Score Threshold para formar n-gramas.
         Ver https://radimrehurek.com/gensim/models/phrases.html
+    materializar : bool | str | Path, optional
+        Si True guarda en memoria frases con solo el texto de cada token; si
+        es ruta (p.ej. frases.jsonl.gz) las guarda en disco. Así frases se
+        recorre una sola vez, en vez de una vez por modelo y al iterar.
+    workers : int, optional
+        Procesos que cuentan n-gramas en paralelo, por lotes de frases.
+    tamano : int, optional
+        Número de frases en cada lote si workers > 1.
 
     Yields
     ------
@@ -33,15 +382,27 @@ class NgramFrases:
         Info de cada frase incluyendo n-gramas.
     """
 
-    def __init__(self, frases, attr="lower_", th=10.0):
+    def __init__(
+        self,
+        frases,
+        attr="lower_",
+        th=10.0,
+        materializar=False,
+        workers=1,
+        tamano=50000,
+    ):
         """Requiere: frases.
 
-        Opcional attr, th.
+        Opcional attr, th, materializar, workers, tamano.
         """
         self.frases = frases
         self.attr = attr
         self.th = th
+        self.materializar = materializar
+        self.workers = workers
+        self.tamano = tamano
 
+        self.guardadas = self.materializar_frases()
         self.models = self.crear_modelos()
 
     def __iter__(self):
@@ -49,13 +410,73 @@ class NgramFrases:
         big = self.models.get("bigrams")
         trig = self.models.get("trigrams")
 
-        for frase in self.frases:
+        for frase in self.frases_compactas():
             info = frase.copy()
-            tokens = [t.get(self.attr) for t in frase.get("tokens")]
-            info["tokens"] = trig[big[tokens]]
+            info["tokens"] = trig[big[frase.get("tokens")]]
 
             yield info
 
+    def compactar(self, frase):
+        """Info de frase con solo el texto de cada token.
+
+        Parameters
+        ----------
+        frase : dict (text: str, tokens: list[dict], meta: dict)
+            Anotaciones lingüísticas de frase.
+
+        Returns
+        -------
+        dict (text: str, tokens: list[str], meta: dict)
+            Info de frase.
+        """
+        info = frase.copy()
+        info["tokens"] = [t.get(self.attr) for t in frase.get("tokens")]
+
+        return info
+
+    def materializar_frases(self):
+        """Recorre frases una vez y las guarda en memoria o disco.
+
+        Returns
+        -------
+        list[dict] | Path | None
+            Frases en memoria, ruta de archivo jsonl, o None si no se guardan.
+        """
+        if not self.materializar:
+            return None
+
+        compactas = (self.compactar(frase) for frase in self.frases)
+
+        if self.materializar is True:
+            guardadas = list(compactas)
+            logger.info(f"{len(guardadas)} frases guardadas en memoria.")
+
+            return guardadas
+
+        ruta = Path(self.materializar).resolve()
+        guardar_jsonl(ruta, compactas)
+        logger.info(f"Frases guardadas en {ruta.name}.")
+
+        return ruta
+
+    def frases_compactas(self):
+        """Info de cada frase con solo el texto de cada token.
+
+        Yields
+        ------
+        dict (text: str, tokens: list[str], meta: dict)
+            Info de cada frase.
+        """
+        if self.guardadas is None:
+            for frase in self.frases:
+                yield self.compactar(frase)
+
+        elif isinstance(self.guardadas, Path):
+            yield from leer_jsonl(self.guardadas)
+
+        else:
+            yield from self.guardadas
+
     def solo_tokens(self):
         """Extrae tokens de cada frase.
 
@@ -64,8 +485,8 @@ class NgramFrases:
         list[str]
             Tokens de cada frase.
         """
-        for frase in self.frases:
-            yield [t.get(self.attr) for t in frase.get("tokens")]
+        for frase in self.frases_compactas():
+            yield frase.get("tokens")
 
     def crear_modelos(self):
         """Crea modelos de n-gramas.
@@ -75,20 +496,287 @@ class NgramFrases:
         dict
             Modelos Phraser para bigramas y trigramas.
         """
-        g = (tokens for tokens in self.solo_tokens())
-        big = Phrases(g, threshold=self.th)
+        big = self.contar()
         bigrams = Phraser(big)
 
         logger.info("Modelo de bi-gramas creado.")
 
-        g = (tokens for tokens in self.solo_tokens())
-        trig = Phrases(bigrams[g], threshold=self.th)
+        trig = self.contar(previo=bigrams)
         trigrams = Phraser(trig)
 
         logger.info("Modelo de tri-gramas creado.")
 
         return dict(bigrams=bigrams, trigrams=trigrams)
 
+    def contar(self, previo=None):
+        """Cuenta n-gramas de frases, en paralelo si workers > 1.
+
+        Parameters
+        ----------
+        previo : gensim.models.phrases.Phraser, optional
+            Modelo a aplicar antes de contar (bigramas al contar trigramas).
+
+        Returns
+        -------
+        gensim.models.Phrases
+            Modelo con conteos de todas las frases.
+        """
+        g = (tokens for tokens in self.solo_tokens())
+
+        if self.workers <= 1:
+            return Phrases(g if previo is None else previo[g], threshold=self.th)
+
+        lotes = iter(lambda: list(islice(g, self.tamano)), [])
+        primero = next(lotes, None)
+        if primero is None:
+            return Phrases([], threshold=self.th)
+
+        lotes = chain([primero], lotes)
+        funcion = partial(contar_frases, th=self.th)
+
+        with ProcessPoolExecutor(
+            max_workers=self.workers, initializer=fijar_previo, initargs=(previo,)
+        ) as executor:
+            modelos = mapear_ordenado(funcion, lotes, executor, 2 * self.workers)
+
+            return unir_frases(modelos)
+
+
+class VistaCorpus:
+    """Vista re-iterable de documentos de un CorpusBow.
+
+    Parameters
+    ----------
+    corpus : banrep.transforma.CorpusBow
+        Corpus materializado.
+    funcion : Callable
+        Función que obtiene el documento i del corpus.
+    """
+
+    def __init__(self, corpus, funcion):
+        """Requiere: corpus, funcion."""
+        self.corpus = corpus
+        self.funcion = funcion
+
+    def __len__(self):
+        return len(self.corpus)
+
+    def __getitem__(self, i):
+        return self.funcion(i)
+
+    def __iter__(self):
+        for i in range(len(self.corpus)):
+            yield self.funcion(i)
+
+
+class VistaUnida:
+    """Vista re-iterable de varias vistas de documentos, una tras otra.
+
+    Parameters
+    ----------
+    vistas : list[Iterable]
+        Vistas re-iterables, por ejemplo `CorpusBow.textos()`.
+    """
+
+    def __init__(self, vistas):
+        """Requiere: vistas."""
+        self.vistas = vistas
+
+    def __len__(self):
+        return sum(len(vista) for vista in self.vistas)
+
+    def __iter__(self):
+        for vista in self.vistas:
+            yield from vista
+
+
+class CorpusBow:
+    """Bags of Words y tokens de documentos en arrays compactos.
+
+    Tokens se guardan como ids del vocabulario, con una tabla adicional
+    para tokens fuera de él (conservan su posición, relevante en coherencia).
+    Bags of Words se guardan como CSR: ids y frecuencias con offsets por
+    documento. Si se da carpeta, arrays se guardan en disco y se leen con
+    memory-map.
+
+    Parameters
+    ----------
+    docs : Iterable[tuple (str, list[str])]
+        Identificador y tokens de cada documento.
+    vocab : gensim.corpora.Dictionary
+        Vocabulario a considerar.
+    carpeta : str | Path, optional
+        Directorio donde guardar arrays.
+
+    Yields
+    ------
+    dict (idm: str, tokens: list[str], sparsed: list[tuple(int, int)])
+        Bags of Words de cada documento.
+    """
+
+    ARRAYS = ("tokens", "pos_tokens", "ids", "frecuencias", "pos_ids")
+
+    def __init__(self, docs=None, vocab=None, carpeta=None):
+        """Requiere: docs, vocab; o solo carpeta para leer corpus guardado.
+
+        Opcional: carpeta.
+        """
+        self.carpeta = crear_carpeta(carpeta) if carpeta else None
+
+        if docs is None:
+            self.cargar()
+        else:
+            self.crear(docs, vocab)
+            if self.carpeta:
+                self.guardar()
+                self.cargar()
+
+    def __len__(self):
+        return len(self.idms)
+
+    def __repr__(self):
+        return f"Corpus de {self.__len__()} documentos y {self.n_vocab} términos."
+
+    def __iter__(self):
+        """Bags Of Words de cada documento."""
+        for i, idm in enumerate(self.idms):
+            yield dict(idm=idm, tokens=self.tokens(i), sparsed=self.bow(i))
+
+    def crear(self, docs, vocab):
+        """Convierte documentos a arrays.
+
+        Parameters
+        ----------
+        docs : Iterable[tuple (str, list[str])]
+            Identificador y tokens de cada documento.
+        vocab : gensim.corpora.Dictionary
+            Vocabulario a considerar.
+        """
+        token2id = vocab.token2id
+        self.n_vocab = 1 + max(token2id.values(), default=-1)
+
+        self.palabras = [None] * self.n_vocab
+        for palabra, i in token2id.items():
+            self.palabras[i] = palabra
+
+        externas = {}
+        self.idms = []
+        tokens, ids, frecuencias = [], [], []
+        pos_tokens, pos_ids = [0], [0]
+
+        for idm, dtoks in docs:
+            doc = []
+            for t in dtoks:
+                j = token2id.get(t)
+                if j is None:
+                    j = externas.setdefault(t, self.n_vocab + len(externas))
+                doc.append(j)
+
+            doc = np.array(doc, dtype=np.int32)
+            unicos, conteos = np.unique(doc[doc < self.n_vocab], return_counts=True)
+
+            self.idms.append(idm)
+            tokens.append(doc)
+            ids.append(unicos.astype(np.int32))
+            frecuencias.append(conteos.astype(np.int32))
+            pos_tokens.append(pos_tokens[-1] + len(doc))
+            pos_ids.append(pos_ids[-1] + len(unicos))
+
+        self.palabras.extend(externas)
+
+        vacio = np.empty(0, dtype=np.int32)
+        self.arrays = dict(
+            tokens=np.concatenate(tokens) if tokens else vacio,
+            pos_tokens=np.array(pos_tokens, dtype=np.int64),
+            ids=np.concatenate(ids) if ids else vacio,
+            frecuencias=np.concatenate(frecuencias) if frecuencias else vacio,
+            pos_ids=np.array(pos_ids, dtype=np.int64),
+        )
+
+    def guardar(self, carpeta=None):
+        """Guarda arrays y tablas del corpus.
+
+        Parameters
+        ----------
+        carpeta : str | Path, optional
+            Directorio donde guardar, si no es el del corpus.
+
+        Returns
+        -------
+        Path
+            Directorio donde se guardó el corpus.
+        """
+        carpeta = crear_carpeta(carpeta) if carpeta else self.carpeta
+
+        for nombre, array in self.arrays.items():
+            np.save(carpeta.joinpath(f"{nombre}.npy"), array)
+
+        info = dict(idms=self.idms, palabras=self.palabras, n_vocab=self.n_vocab)
+        with open(carpeta.joinpath("corpus.json"), "w", encoding="utf-8") as out:
+            json.dump(info, out, ensure_ascii=False)
+
+        return carpeta
+
+    def cargar(self):
+        """Lee corpus guardado en carpeta, con memory-map de arrays."""
+        self.arrays = {
+            nombre: np.load(self.carpeta.joinpath(f"{nombre}.npy"), mmap_mode="r")
+            for nombre in self.ARRAYS
+        }
+
+        with open(self.carpeta.joinpath("corpus.json"), encoding="utf-8") as f:
+            info = json.load(f)
+
+        self.idms = info.get("idms")
+        self.palabras = info.get("palabras")
+        self.n_vocab = info.get("n_vocab")
+
+    def tokens(self, i):
+        """Tokens de documento i.
+
+        Parameters
+        ----------
+        i : int
+            Posición del documento.
+
+        Returns
+        -------
+        list[str]
+            Tokens del documento.
+        """
+        pos = self.arrays["pos_tokens"]
+        tokens = self.arrays["tokens"][pos[i] : pos[i + 1]]
+        palabras = self.palabras
+
+        return [palabras[j] for j in tokens.tolist()]
+
+    def bow(self, i):
+        """Bag of Words de documento i.
+
+        Parameters
+        ----------
+        i : int
+            Posición del documento.
+
+        Returns
+        -------
+        list[tuple(int, int)]
+            Id y frecuencia de tokens en vocabulario.
+        """
+        pos = self.arrays["pos_ids"]
+        ids = self.arrays["ids"][pos[i] : pos[i + 1]]
+        frecuencias = self.arrays["frecuencias"][pos[i] : pos[i + 1]]
+
+        return list(zip(ids.tolist(), frecuencias.tolist()))
+
+    def sparsed(self):
+        """Bag of Words de cada documento, re-iterable."""
+        return VistaCorpus(self, self.bow)
+
+    def textos(self):
+        """Tokens de cada documento, re-iterable."""
+        return VistaCorpus(self, self.tokens)
+
 
 class Bags:
     """Documentos como Bag Of Words.
@@ -103,6 +791,21 @@ class Bags:
         Atributo a usar de token (text | lower_). None si ngramas.
     vocab : gensim.corpora.Dictionary, optional
         Vocabulario a considerar.
+    materializar : bool | str | Path, optional
+        Si True crea CorpusBow en memoria; si es ruta lo guarda en disco.
+        Así frases se agrupan y convierten una sola vez.
+    no_below : int, optional
+        Mínimo de frases en que debe estar un término del vocabulario.
+    no_above : float, optional
+        Máxima fracción de frases en que puede estar un término.
+    keep_n : int, optional
+        Máximo de términos (más frecuentes) del vocabulario.
+    prune_at : int | None, optional
+        Máximo de términos mientras cuenta; descarta los menos frecuentes.
+    workers : int, optional
+        Procesos que crean diccionarios parciales, unidos al final.
+    tamano : int, optional
+        Número de frases en cada diccionario parcial si workers > 1.
 
     Yields
     ------
@@ -110,15 +813,35 @@ class Bags:
         Bags of Words de cada documento.
     """
 
-    def __init__(self, frases, idm, attr=None, vocab=None):
+    def __init__(
+        self,
+        frases,
+        idm,
+        attr=None,
+        vocab=None,
+        materializar=False,
+        no_below=None,
+        no_above=None,
+        keep_n=None,
+        prune_at=2000000,
+        workers=1,
+        tamano=100000,
+    ):
         """Requiere frases, idm.
 
-        Opcional: attr, vocab.
+        Opcional: attr, vocab, materializar, no_below, no_above, keep_n,
+        prune_at, workers, tamano.
         """
         self.frases = frases
         self.idm = idm
         self.attr = attr
         self.vocab = vocab
+        self.no_below = no_below
+        self.no_above = no_above
+        self.keep_n = keep_n
+        self.prune_at = prune_at
+        self.workers = workers
+        self.tamano = tamano
 
         self.n = 0
 
@@ -126,6 +849,13 @@ class Bags:
             self.vocab = self.crear_vocab()
             logger.info(f"Diccionario con {len(self.vocab)} términos creado...")
 
+        self.corpus = None
+        if materializar:
+            carpeta = None if materializar is True else materializar
+            self.corpus = CorpusBow(self.documentos(), self.vocab, carpeta)
+            self.n = len(self.corpus)
+            logger.info(f"{self.corpus}")
+
     def __len__(self):
         return self.n
 
@@ -134,7 +864,23 @@ class Bags:
 
     def __iter__(self):
         """Bags Of Words de cada documento."""
+        if self.corpus is not None:
+            yield from self.corpus
+            return
+
         self.n = 0
+        for k, dtoks in self.documentos():
+            self.n += 1
+            yield dict(idm=k, tokens=dtoks, sparsed=self.vocab.doc2bow(dtoks))
+
+    def documentos(self):
+        """Agrupa tokens de frases de cada documento.
+
+        Yields
+        ------
+        tuple (str, list[str])
+            Identificador y tokens de cada documento.
+        """
         for k, g in groupby(self.frases, lambda x: x.get("meta").get(self.idm)):
             dtoks = []
             for frase in g:
@@ -145,17 +891,90 @@ class Bags:
 
                 dtoks.extend(tokens)
 
-            self.n += 1
-            yield dict(idm=k, tokens=dtoks, sparsed=self.vocab.doc2bow(dtoks))
+            yield k, dtoks
+
+    def materializado(self):
+        """CorpusBow de bags, creado en memoria si no fue materializado.
+
+        Returns
+        -------
+        banrep.transforma.CorpusBow
+        """
+        if self.corpus is not None:
+            return self.corpus
+
+        return CorpusBow(self.documentos(), self.vocab)
+
+    def solo_tokens(self):
+        """Extrae tokens de cada frase.
+
+        Yields
+        ------
+        list[str]
+            Tokens de cada frase.
+        """
+        for frase in self.frases:
+            if self.attr:
+                yield [t.get(self.attr) for t in frase.get("tokens")]
+            else:
+                yield frase.get("tokens")
 
     def crear_vocab(self):
-        """Crea diccionario de términos presentes."""
-        if self.attr:
-            return Dictionary(
-                [t.get(self.attr) for t in frase.get("tokens")] for frase in self.frases
-            )
+        """Crea diccionario de términos presentes.
+
+        Si workers > 1 crea diccionarios parciales por lotes de frases en
+        procesos y los une. Luego aplica no_below, no_above y keep_n.
+
+        Returns
+        -------
+        gensim.corpora.Dictionary
+            Vocabulario de frases.
+        """
+        if self.workers > 1:
+            g = self.solo_tokens()
+            lotes = iter(lambda: list(islice(g, self.tamano)), [])
+            funcion = partial(crear_diccionario, prune_at=self.prune_at)
+
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                parciales = mapear_ordenado(funcion, lotes, executor, 2 * self.workers)
+                vocab = unir_diccionarios(parciales, prune_at=self.prune_at)
         else:
-            return Dictionary(frase.get("tokens") for frase in self.frases)
+            vocab = Dictionary(self.solo_tokens(), prune_at=self.prune_at)
+
+        if self.no_below or self.no_above or self.keep_n:
+            vocab.filter_extremes(
+                no_below=self.no_below or 0,
+                no_above=self.no_above or 1.0,
+                keep_n=self.keep_n,
+            )
+
+        return vocab
+
+    def guardar_vocab(self, archivo):
+        """Guarda vocabulario como texto (comprimido si termina en .gz o .bz2).
+
+        Parameters
+        ----------
+        archivo : str | Path
+            Ruta del archivo, para usar luego con `Bags.cargar_vocab`.
+        """
+        self.vocab.save_as_text(str(archivo))
+
+    @staticmethod
+    def cargar_vocab(archivo):
+        """Lee vocabulario guardado con `Bags.guardar_vocab`.
+
+        Parameters
+        ----------
+        archivo : str | Path
+            Ruta del archivo.
+
+        Returns
+        -------
+        gensim.corpora.Dictionary
+            Vocabulario, para usar como `Bags(vocab=...)`.
+        """
+        return Dictionary.load_from_text(str(archivo))
 
 
 class Topicos:
@@ -170,21 +989,40 @@ class Topicos:
     params : dict
         Parámetros requeridos en modelos LDA.
         Ver https://radimrehurek.com/gensim/models/ldamodel.html
+    workers : int, optional
+        Procesos que crean y evalúan modelos de diferentes k a la vez.
+        Usan el corpus guardado en disco (CorpusBow) con memory-map.
+    carpeta : str | Path, optional
+        Directorio donde guardar cada modelo y su score al crearlo. Si ya
+        contiene modelos creados con los mismos params y vocabulario, estos
+        se leen en vez de crearlos de nuevo.
 
     Yields
     ------
     dict (k:int, modelo: gensim.models.ldamodel.LdaModel, score: float)
-        Modelo de Tópicos para cada k.
+        Modelo de Tópicos para cada k, en el orden de kas.
+        Ver también `Topicos.buscar` para evaluar solo algunos k.
     """
 
-    def __init__(self, bags, kas, params):
-        """Requiere bags, kas, params."""
+    def __init__(self, bags, kas, params, workers=1, carpeta=None):
+        """Requiere bags, kas, params.
+
+        Opcional: workers, carpeta.
+        """
         self.bags = bags
         self.kas = kas
         self.params = params
+        self.workers = workers
+        self.carpeta = crear_carpeta(carpeta) if carpeta else None
+        self.firma = self.calcular_firma() if carpeta else None
 
         self.best = 0
         self.score = 0
+        self.evaluados = dict()
+        self.evaluador = None
+
+        self.inicio = None
+        self.presupuesto = None
 
     def __repr__(self):
         fmstr = f"Mejor k={self.best} con Coherence Score={self.score:.3f}"
@@ -192,17 +1030,447 @@ class Topicos:
 
     def __iter__(self):
         """Modelo LDA para cada k."""
-        for k in self.kas:
-            modelo = self.crear_modelo(k, [b.get("sparsed") for b in self.bags])
-            score = self.evaluar(modelo, [b.get("tokens") for b in self.bags])
+        for k, modelo, score in self.modelos(self.kas):
+            yield self.registrar(k, modelo, score)
+
+    def registrar(self, k, modelo, score):
+        """Registra k evaluado y actualiza mejor k.
+
+        Parameters
+        ----------
+        k : int
+            Número de tópicos del modelo.
+        modelo : gensim.models.ldamodel.LdaModel
+        score : float
+            Coherence Score del modelo.
+
+        Returns
+        -------
+        dict (k:int, modelo: gensim.models.ldamodel.LdaModel, score: float)
+            Modelo de Tópicos para k.
+        """
+        logger.info(f"Modelo de {k} tópicos creado y evaluado.")
+
+        self.evaluados[k] = score
+        if score > self.score:
+            self.score = score
+            self.best = k
+
+        return dict(k=k, modelo=modelo, score=score)
+
+    def modelos(self, kas, corpus=None):
+        """Crea y evalúa modelo LDA para cada k, en serie o en paralelo.
+
+        Modelos ya guardados en carpeta se leen en vez de crearlos, y modelos
+        nuevos se guardan apenas son evaluados.
+
+        Parameters
+        ----------
+        kas : Iterable[int]
+            Diferentes k tópicos para los cuales crear modelo.
+        corpus : banrep.transforma.CorpusBow, optional
+            Corpus materializado de bags, se crea solo si hay k pendientes.
+
+        Yields
+        ------
+        tuple (int, gensim.models.ldamodel.LdaModel, float)
+            k, modelo y Coherence Score, en el orden de kas.
+        """
+        kas = list(kas)
+        guardados = self.leer_puntajes()
+        pendientes = [k for k in kas if k not in guardados]
+
+        nuevos = iter([])
+        if pendientes:
+            if corpus is None:
+                corpus = self.bags.materializado()
+
+            if self.workers > 1:
+                nuevos = self.modelos_paralelo(pendientes, corpus)
+            else:
+                nuevos = self.modelos_serie(pendientes, corpus)
+
+        for k in kas:
+            if k in guardados:
+                logger.info(f"Modelo de {k} tópicos leído de {self.carpeta.name}.")
+                modelo = self.cargar_modelo(k)
+
+                score = guardados[k]
+                if score is None:
+                    if corpus is None:
+                        corpus = self.bags.materializado()
+
+                    score = self.crear_evaluador(corpus)(modelo)
+                    self.guardar_puntaje(k, score)
+
+                yield k, modelo, score
+            else:
+                k, modelo, score = next(nuevos)
+                self.guardar_modelo(k, modelo, score)
+                yield k, modelo, score
+
+    def ruta_modelo(self, k):
+        """Ruta de modelo de k tópicos en carpeta."""
+        return self.carpeta.joinpath(f"lda-{k:03}.model")
+
+    def calcular_firma(self):
+        """Identifica params y vocabulario con que se crean los modelos.
+
+        Returns
+        -------
+        str
+            Hash blake2b de la configuración.
+        """
+        vocab = self.bags.vocab
+        palabras = sorted(vocab.token2id.items(), key=lambda x: x[1])
+        config = {"params": self.params, "n_vocab": len(vocab), "vocab": palabras}
+        serial = json.dumps(config, sort_keys=True, ensure_ascii=False, default=str)
+
+        return hashlib.blake2b(serial.encode("utf-8"), digest_size=8).hexdigest()
+
+    def leer_puntajes(self):
+        """Lee Coherence Score de modelos guardados en carpeta.
+
+        Modelos guardados con otros params o vocabulario se ignoran.
+
+        Returns
+        -------
+        dict (int: float | None)
+            Score de cada k con modelo guardado, None si debe evaluarse.
+        """
+        if self.carpeta is None:
+            return dict()
+
+        archivo = self.carpeta.joinpath("puntajes.json")
+        if not archivo.is_file():
+            return dict()
+
+        with open(archivo, encoding="utf-8") as f:
+            guardado = json.load(f)
+
+        if guardado.get("firma") != self.firma:
+            logger.warning(f"Ignorando modelos con otra configuración en {archivo}.")
+            return dict()
+
+        puntajes = guardado.get("puntajes", dict())
+
+        return {
+            int(k): v for k, v in puntajes.items() if self.ruta_modelo(int(k)).is_file()
+        }
+
+    def guardar_puntaje(self, k, score):
+        """Guarda score de k en carpeta, reemplazando el archivo anterior.
+
+        Parameters
+        ----------
+        k : int
+            Número de tópicos del modelo.
+        score : float | None
+            Coherence Score del modelo, None si debe evaluarse de nuevo.
+        """
+        puntajes = {str(k): v for k, v in self.leer_puntajes().items()}
+        puntajes[str(k)] = score
+
+        archivo = self.carpeta.joinpath("puntajes.json")
+        temporal = archivo.with_name(f"{archivo.name}.tmp")
+        with open(temporal, "w", encoding="utf-8") as out:
+            json.dump(dict(firma=self.firma, puntajes=puntajes), out)
+
+        os.replace(temporal, archivo)
+
+    def guardar_modelo(self, k, modelo, score):
+        """Guarda modelo y su score en carpeta, si hay carpeta.
 
-            logger.info(f"Modelo de {k} tópicos creado y evaluado.")
+        Parameters
+        ----------
+        k : int
+            Número de tópicos del modelo.
+        modelo : gensim.models.ldamodel.LdaModel
+        score : float | None
+            Coherence Score del modelo.
+        """
+        if self.carpeta is None:
+            return
+
+        modelo.save(str(self.ruta_modelo(k)))
+        self.guardar_puntaje(k, score)
+
+    def cargar_modelo(self, k):
+        """Lee modelo de k tópicos guardado en carpeta.
+
+        Parameters
+        ----------
+        k : int
+            Número de tópicos del modelo.
+
+        Returns
+        -------
+        gensim.models.ldamodel.LdaModel
+        """
+        return LdaModel.load(str(self.ruta_modelo(k)))
+
+    def actualizar(self, k, bags, modelo=None, textos=None):
+        """Actualiza modelo de k tópicos con nuevos documentos.
+
+        Continúa el entrenamiento en vez de crear el modelo de nuevo, y lo
+        evalúa de nuevo: por defecto sobre textos anteriores (de self.bags) y
+        nuevos (de bags). Ese score reemplaza al anterior, también en carpeta,
+        por lo que puede no ser comparable con el de otros k si estos se
+        evaluaron solo sobre textos anteriores.
+
+        Parameters
+        ----------
+        k : int
+            Número de tópicos del modelo.
+        bags : banrep.transforma.Bags
+            Bags of Words de nuevos documentos, con el mismo vocabulario.
+        modelo : gensim.models.ldamodel.LdaModel, optional
+            Modelo a actualizar, si no se lee de carpeta.
+        textos : Iterable (list[str]), optional
+            Palabras de cada documento sobre el cual evaluar, re-iterable.
+
+        Returns
+        -------
+        gensim.models.ldamodel.LdaModel
+            Modelo actualizado.
+        """
+        if bags.vocab.token2id != self.bags.vocab.token2id:
+            raise ValueError("Bags debe usar el mismo vocabulario de los modelos.")
+
+        if modelo is None:
+            modelo = self.cargar_modelo(k)
+
+        nuevos = bags.materializado()
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            modelo.update(nuevos.sparsed())
+
+        logger.info(f"Modelo de {k} tópicos actualizado con {len(bags)} documentos.")
 
-            if score > self.score:
-                self.score = score
-                self.best = k
+        if textos is None:
+            textos = VistaUnida([self.bags.materializado().textos(), nuevos.textos()])
 
-            yield dict(k=k, modelo=modelo, score=score)
+        score = self.evaluar(modelo, textos)
+
+        self.evaluados[k] = score
+        self.best = max(self.evaluados, key=self.evaluados.get)
+        self.score = self.evaluados[self.best]
+
+        self.guardar_modelo(k, modelo, score)
+
+        return modelo
+
+    def modelos_serie(self, kas, corpus):
+        """Crea modelo LDA para cada k, uno tras otro, y luego los evalúa.
+
+        Co-ocurrencias de las palabras de todos los modelos se cuentan una
+        sola vez, ver `EvaluadorCoherencia.preparar`.
+
+        Parameters
+        ----------
+        kas : Iterable[int]
+            Diferentes k tópicos para los cuales crear modelo.
+        corpus : banrep.transforma.CorpusBow
+            Corpus materializado de bags.
+
+        Yields
+        ------
+        tuple (int, gensim.models.ldamodel.LdaModel, float)
+            k, modelo y Coherence Score.
+        """
+        sparsed = corpus.sparsed()
+        modelos = [(k, self.crear_modelo(k, sparsed)) for k in kas]
+
+        evaluador = self.crear_evaluador(corpus)
+        evaluador.preparar(modelo for _, modelo in modelos)
+
+        for k, modelo in modelos:
+            yield k, modelo, evaluador(modelo)
+
+    def crear_evaluador(self, corpus):
+        """EvaluadorCoherencia compartido por modelos de un mismo corpus.
+
+        Parameters
+        ----------
+        corpus : banrep.transforma.CorpusBow
+            Corpus materializado de bags.
+
+        Returns
+        -------
+        banrep.transforma.EvaluadorCoherencia
+        """
+        if self.evaluador is None or self.evaluador.textos.corpus is not corpus:
+            self.evaluador = EvaluadorCoherencia(corpus.textos(), self.bags.vocab)
+
+        return self.evaluador
+
+    def modelos_paralelo(self, kas, corpus):
+        """Crea y evalúa modelos LDA de varios k a la vez en procesos.
+
+        Parameters
+        ----------
+        kas : Iterable[int]
+            Diferentes k tópicos para los cuales crear modelo.
+        corpus : banrep.transforma.CorpusBow
+            Corpus materializado de bags, se guarda en disco si no lo está.
+
+        Yields
+        ------
+        tuple (int, gensim.models.ldamodel.LdaModel, float)
+            k, modelo y Coherence Score, en el orden de kas.
+        """
+        with TemporaryDirectory() as temporal:
+            carpeta = corpus.carpeta or corpus.guardar(temporal)
+            funcion = partial(
+                modelar_k, carpeta=carpeta, vocab=self.bags.vocab, params=self.params
+            )
+
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                yield from mapear_ordenado(funcion, kas, executor, self.workers)
+
+    def buscar(self, estrategia="gruesa", presupuesto=None):
+        """Busca mejor k evaluando solo valores prometedores de kas.
+
+        Estrategias:
+
+        - gruesa: evalúa kas espaciados y refina alrededor del mejor, reduciendo
+          el espacio a la mitad hasta llegar a k consecutivos.
+        - dorada: búsqueda de sección dorada, supone que la coherencia tiene
+          un solo máximo en kas.
+
+        Cada k evaluado queda en `evaluados` (k: score).
+
+        Parameters
+        ----------
+        estrategia : str (gruesa | dorada), optional
+            Estrategia de búsqueda.
+        presupuesto : float, optional
+            Segundos máximos de búsqueda; no se crean modelos nuevos después.
+
+        Yields
+        ------
+        dict (k:int, modelo: gensim.models.ldamodel.LdaModel, score: float)
+            Modelo de Tópicos para cada k evaluado.
+        """
+        estrategias = dict(gruesa=self.busqueda_gruesa, dorada=self.busqueda_dorada)
+        if estrategia not in estrategias:
+            raise ValueError(f"Estrategia {estrategia} no soportada (gruesa | dorada).")
+
+        candidatos = sorted(set(self.kas))
+        if not candidatos:
+            return
+
+        self.inicio = time.perf_counter()
+        self.presupuesto = presupuesto
+
+        corpus = self.bags.materializado()
+        with TemporaryDirectory() as temporal:
+            if self.workers > 1 and corpus.carpeta is None:
+                corpus = CorpusBow(carpeta=corpus.guardar(temporal))
+
+            yield from estrategias[estrategia](candidatos, corpus)
+
+        logger.info(f"Búsqueda evaluó {len(self.evaluados)} de {len(candidatos)} k.")
+
+    def agotado(self):
+        """Determina si se agotó el presupuesto de tiempo de búsqueda."""
+        if self.presupuesto is None:
+            return False
+
+        return time.perf_counter() - self.inicio >= self.presupuesto
+
+    def evaluar_kas(self, kas, corpus):
+        """Crea y evalúa modelos de kas aún no evaluados, según presupuesto.
+
+        Parameters
+        ----------
+        kas : Iterable[int]
+            Diferentes k tópicos para los cuales crear modelo.
+        corpus : banrep.transforma.CorpusBow
+            Corpus materializado de bags.
+
+        Yields
+        ------
+        dict (k:int, modelo: gensim.models.ldamodel.LdaModel, score: float)
+            Modelo de Tópicos para cada k evaluado.
+        """
+        pendientes = [k for k in kas if k not in self.evaluados]
+        if not pendientes or self.agotado():
+            return
+
+        for k, modelo, score in self.modelos(pendientes, corpus):
+            yield self.registrar(k, modelo, score)
+
+            if self.agotado():
+                logger.info("Presupuesto de búsqueda agotado.")
+                return
+
+    def busqueda_gruesa(self, candidatos, corpus):
+        """Evalúa candidatos espaciados y refina alrededor del mejor.
+
+        Parameters
+        ----------
+        candidatos : list[int]
+            Valores de k ordenados.
+        corpus : banrep.transforma.CorpusBow
+            Corpus materializado de bags.
+
+        Yields
+        ------
+        dict (k:int, modelo: gensim.models.ldamodel.LdaModel, score: float)
+            Modelo de Tópicos para cada k evaluado.
+        """
+        n = len(candidatos)
+        paso = max(1, int(math.sqrt(n)))
+
+        indices = sorted(set(range(0, n, paso)) | {n - 1})
+        yield from self.evaluar_kas([candidatos[i] for i in indices], corpus)
+
+        while paso > 1 and not self.agotado():
+            i = max(
+                (i for i, k in enumerate(candidatos) if k in self.evaluados),
+                key=lambda i: (self.evaluados[candidatos[i]], -i),
+            )
+            nuevo = max(1, paso // 2)
+            indices = range(max(0, i - paso), min(n, i + paso + 1), nuevo)
+            paso = nuevo
+
+            yield from self.evaluar_kas([candidatos[j] for j in indices], corpus)
+
+    def busqueda_dorada(self, candidatos, corpus):
+        """Búsqueda de sección dorada del máximo de coherencia en candidatos.
+
+        Parameters
+        ----------
+        candidatos : list[int]
+            Valores de k ordenados.
+        corpus : banrep.transforma.CorpusBow
+            Corpus materializado de bags.
+
+        Yields
+        ------
+        dict (k:int, modelo: gensim.models.ldamodel.LdaModel, score: float)
+            Modelo de Tópicos para cada k evaluado.
+        """
+        phi = (math.sqrt(5) - 1) / 2
+        a, b = 0, len(candidatos) - 1
+
+        while b - a > 2:
+            c = b - round(phi * (b - a))
+            d = a + round(phi * (b - a))
+            if c >= d:
+                break
+
+            yield from self.evaluar_kas([candidatos[c], candidatos[d]], corpus)
+            if self.agotado():
+                return
+
+            if self.evaluados[candidatos[c]] >= self.evaluados[candidatos[d]]:
+                b = d
+            else:
+                a = c
+
+        yield from self.evaluar_kas(candidatos[a : b + 1], corpus)
 
     def crear_modelo(self, k, sparsed):
         """Crea modelo LDA de k tópicos.
@@ -219,13 +1487,7 @@ class Topicos:
         gensim.models.ldamodel.LdaModel
             Modelo LDA de k tópicos.
         """
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore")
-            modelo = LdaModel(
-                sparsed, num_topics=k, id2word=self.bags.vocab, **self.params
-            )
-
-        return modelo
+        return crear_lda(k, sparsed, self.bags.vocab, self.params)
 
     def evaluar(self, modelo, textos):
         """Calcula Coherence Score de modelo de tópicos.
@@ -241,8 +1503,4 @@ class Topicos:
         float
             Coherencia calculada.
         """
-        cm = CoherenceModel(
-            model=modelo, texts=textos, dictionary=self.bags.vocab, coherence="c_v",
-        )
-
-        return cm.get_coherence()
+        return calcular_coherencia(modelo, textos, self.bags.vocab)
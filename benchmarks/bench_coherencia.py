@@ -0,0 +1,69 @@
+# coding: utf-8
+"""Mide Coherence Score de varios modelos: CoherenceModel por modelo o compartido.
+
+    python benchmarks/bench_coherencia.py --docs 1000 --procesos 1
+"""
+import argparse
+import random
+import time
+
+from gensim.corpora import Dictionary
+
+from banrep.transforma import EvaluadorCoherencia, calcular_coherencia, crear_lda
+
+
+def crear_textos(n, semilla=0):
+    """Crea documentos con tokens de un vocabulario zipfiano."""
+    rnd = random.Random(semilla)
+    palabras = [f"palabra{i}" for i in range(5000)]
+    pesos = [1 / (i + 1) for i in range(len(palabras))]
+
+    return [
+        rnd.choices(palabras, weights=pesos, k=rnd.randint(100, 300)) for _ in range(n)
+    ]
+
+
+def medir(nombre, funcion, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    print(f"{nombre:>24}: {time.perf_counter() - inicio:.3f} s")
+
+    return resultado
+
+
+def por_modelo(modelos, textos, vocab, procesos):
+    return [calcular_coherencia(m, textos, vocab, procesos=procesos) for m in modelos]
+
+
+def compartido(modelos, textos, vocab, procesos):
+    evaluador = EvaluadorCoherencia(textos, vocab, procesos=procesos)
+    evaluador.preparar(modelos)
+
+    return [evaluador(m) for m in modelos]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--docs", default=1000, type=int)
+    parser.add_argument("--kas", default=[5, 10, 15, 20, 25, 30], type=int, nargs="+")
+    parser.add_argument("--procesos", default=1, type=int)
+    args = parser.parse_args()
+
+    textos = crear_textos(args.docs)
+    vocab = Dictionary(textos)
+    sparsed = [vocab.doc2bow(texto) for texto in textos]
+    modelos = [crear_lda(k, sparsed, vocab, dict(random_state=k)) for k in args.kas]
+
+    esperados = medir(
+        "CoherenceModel por k", por_modelo, modelos, textos, vocab, args.procesos
+    )
+    obtenidos = medir(
+        "EvaluadorCoherencia", compartido, modelos, textos, vocab, args.procesos
+    )
+
+    for esperado, obtenido in zip(esperados, obtenidos):
+        assert abs(esperado - obtenido) < 1e-9
+
+
+if __name__ == "__main__":
+    main()
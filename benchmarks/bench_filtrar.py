@@ -0,0 +1,56 @@
+# coding: utf-8
+"""Mide filtrar_cortas en textos de varios megabytes.
+
+    python benchmarks/bench_filtrar.py --mb 8
+"""
+import argparse
+import random
+import time
+
+from banrep.preprocesos import filtrar_cortas
+
+
+def filtrar_cuadratico(texto, chars=0):
+    """Implementación anterior, concatenando en cada línea."""
+    filtrado = ""
+    for linea in texto.splitlines():
+        if len(linea) > chars:
+            filtrado += linea + "\n"
+
+    return filtrado
+
+
+def crear_texto(mb, semilla=0):
+    """Crea texto con líneas de longitud variable hasta mb megabytes."""
+    rnd = random.Random(semilla)
+    lineas, total = [], 0
+    while total < mb * 1e6:
+        linea = "x" * rnd.randint(0, 120)
+        lineas.append(linea)
+        total += len(linea) + 1
+
+    return "\n".join(lineas)
+
+
+def medir(nombre, funcion, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    print(f"{nombre:>24}: {time.perf_counter() - inicio:.3f} s")
+
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mb", default=8, type=int)
+    parser.add_argument("--chars", default=20, type=int)
+    args = parser.parse_args()
+
+    texto = crear_texto(args.mb)
+    a = medir("cuadrático", filtrar_cuadratico, texto, chars=args.chars)
+    b = medir("filtrar_cortas", filtrar_cortas, texto, chars=args.chars)
+    assert a == b
+
+
+if __name__ == "__main__":
+    main()
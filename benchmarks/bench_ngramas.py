@@ -0,0 +1,58 @@
+# coding: utf-8
+"""Mide conteo de n-gramas de NgramFrases en serie y en paralelo.
+
+    python benchmarks/bench_ngramas.py --frases 200000 --workers 4
+"""
+import argparse
+import random
+import time
+
+from banrep.transforma import NgramFrases
+
+
+def crear_frases(n, semilla=0):
+    """Crea frases con tokens de un vocabulario zipfiano."""
+    rnd = random.Random(semilla)
+    palabras = [f"palabra{i}" for i in range(20000)]
+    pesos = [1 / (i + 1) for i in range(len(palabras))]
+
+    frases = []
+    for i in range(n):
+        tokens = rnd.choices(palabras, weights=pesos, k=rnd.randint(5, 30))
+        frases.append(dict(tokens=[{"lower_": t} for t in tokens], meta={"i": i}))
+
+    return frases
+
+
+def medir(nombre, funcion, *args, **kwargs):
+    inicio = time.perf_counter()
+    resultado = funcion(*args, **kwargs)
+    print(f"{nombre:>24}: {time.perf_counter() - inicio:.3f} s")
+
+    return resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--frases", default=200000, type=int)
+    parser.add_argument("--workers", default=4, type=int)
+    parser.add_argument("--tamano", default=25000, type=int)
+    args = parser.parse_args()
+
+    frases = crear_frases(args.frases)
+    serial = medir("serie", NgramFrases, frases, materializar=True)
+    paralelo = medir(
+        f"{args.workers} workers",
+        NgramFrases,
+        frases,
+        materializar=True,
+        workers=args.workers,
+        tamano=args.tamano,
+    )
+
+    for nombre in ("bigrams", "trigrams"):
+        assert serial.models[nombre].phrasegrams == paralelo.models[nombre].phrasegrams
+
+
+if __name__ == "__main__":
+    main()
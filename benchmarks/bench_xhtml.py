@@ -0,0 +1,61 @@
+# coding: utf-8
+"""Compara procesar_xhtml con BeautifulSoup y en modo streaming.
+
+Cada modo corre en un proceso aparte para medir memoria máxima (RSS).
+
+    python benchmarks/bench_xhtml.py --paginas 1000
+"""
+import argparse
+import resource
+import subprocess
+import sys
+import time
+
+
+def crear_xhtml(paginas, parrafos=20):
+    """Crea xhtml similar al que devuelve Tika para un reporte largo."""
+    partes = ['<html xmlns="http://www.w3.org/1999/xhtml"><body>']
+    for i in range(paginas):
+        partes.append('<div class="page">')
+        for j in range(parrafos):
+            partes.append(
+                f"<p>Página {i} párrafo {j}: la infla-\nción anual de 2020fue "
+                f"<b>3,8%</b> según el Banco de la República.</p>"
+            )
+        partes.append("</div>")
+    partes.append("</body></html>")
+
+    return "".join(partes)
+
+
+def correr(modo, paginas):
+    from banrep.extraccion import procesar_xhtml
+
+    content = crear_xhtml(paginas)
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    inicio = time.perf_counter()
+    texto = procesar_xhtml(content, chars=5, streaming=modo == "streaming")
+    segundos = time.perf_counter() - inicio
+
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base
+    print(f"{modo:>10}: {segundos:.2f} s, +{pico / 1024:.1f} MB, {len(texto)} chars")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--paginas", default=1000, type=int)
+    parser.add_argument("--modo", choices=["bs4", "streaming"])
+    args = parser.parse_args()
+
+    if args.modo:
+        correr(args.modo, args.paginas)
+        return
+
+    for modo in ("bs4", "streaming"):
+        cmd = [sys.executable, __file__, "--paginas", str(args.paginas), "--modo", modo]
+        subprocess.run(cmd, check=True)
+
+
+if __name__ == "__main__":
+    main()